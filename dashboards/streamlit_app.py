@@ -5,17 +5,34 @@ E-Commerce Analytics Dashboard
 Interactive Streamlit dashboard for exploring e-commerce metrics.
 Connects to the processed data from the ETL pipeline.
 
+The DuckDB connection returned by get_connection() is a single resource
+shared by every session without copying. Treat it as read-only: query it
+through run_query() and never create, replace or drop views elsewhere.
+
+The @st.cache_data helpers are keyed on the mtime of the parquet file they
+read (from table_mtime()), so they are recomputed only when the ETL rewrites
+it and reruns triggered by unrelated widgets reuse their results. The
+connection (get_* helpers) and DataFrame (figure builders) arguments are
+underscore-prefixed, which Streamlit does not hash. Frames returned by the
+cached get_* helpers are likewise treated as read-only.
+
+plotly.express is imported inside the functions that use it: Streamlit already
+loads plotly.graph_objects, but express adds noticeably to cold start and the
+Overview and Funnel pages do not need it.
+
 Usage:
     streamlit run dashboards/streamlit_app.py
 """
 
 import sys
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import duckdb
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
+import pyarrow as pa
 import streamlit as st
 from plotly.subplots import make_subplots
 
@@ -54,29 +71,119 @@ st.markdown(
 )
 
 
-@st.cache_data(ttl=3600)
-def load_data() -> dict[str, pd.DataFrame]:
-    """Load processed data from parquet files."""
-    data_dir = PROJECT_ROOT / "data" / "processed"
+DATA_DIR = PROJECT_ROOT / "data" / "processed"
+
+TABLES = [
+    "fct_events",
+    "fct_sessions",
+    "fct_daily_metrics",
+    "fct_product_performance",
+]
 
-    data = {}
+# Upper bound on points sent to the browser per time-series trace
+MAX_TREND_POINTS = 1000
 
-    # Load each table if it exists
-    tables = [
-        "fct_events",
-        "fct_sessions",
-        "fct_daily_metrics",
-        "fct_product_performance",
-    ]
+# Engagement chart columns, in subplot trace order
+ENGAGEMENT_METRICS = ["unique_users", "total_revenue", "unique_sessions", "conversion_rate"]
 
-    for table in tables:
-        file_path = data_dir / f"{table}.parquet"
+# Session duration histogram: sessions shorter than an hour, in fixed-width bins
+DURATION_BINS = 50
+MAX_SESSION_SECONDS = 3600
+
+DATE_RANGE_DAYS = {
+    "Last 7 Days": 7,
+    "Last 14 Days": 14,
+    "Last 30 Days": 30,
+    "All Time": None,
+}
+
+
+@st.cache_resource(ttl=3600)
+def get_connection() -> duckdb.DuckDBPyConnection:
+    """
+    Create an in-memory DuckDB connection with a view per processed table.
+
+    Views are lazy: each query reads only the columns and row groups it
+    needs from the parquet files instead of loading whole tables up front.
+    Cached with st.cache_resource so the handle is neither hashed nor copied
+    per session; only small derived results are cached with st.cache_data.
+    """
+    con = duckdb.connect()
+
+    # Register each table if it exists
+    for table in TABLES:
+        file_path = DATA_DIR / f"{table}.parquet"
         if file_path.exists():
-            data[table] = pd.read_parquet(file_path)
+            # Views can't take bound parameters; the relational API keeps the
+            # path out of the SQL text
+            con.read_parquet(file_path.as_posix()).create_view(table)
         else:
             st.warning(f"Data file not found: {file_path}")
 
-    return data
+    return con
+
+
+def list_tables(con: duckdb.DuckDBPyConnection) -> set[str]:
+    """Get the names of the registered table views."""
+    sql = "SELECT view_name FROM duckdb_views() WHERE NOT internal"
+    rows = con.cursor().execute(sql).fetchall()
+    return {row[0] for row in rows}
+
+
+def table_columns(con: duckdb.DuckDBPyConnection, table: str) -> list[str]:
+    """Get the column names of a registered table view."""
+    return [col[0] for col in con.cursor().execute(f"SELECT * FROM {table} LIMIT 0").description]
+
+
+def query_arrow(con: duckdb.DuckDBPyConnection, sql: str, params: list | None = None) -> pa.Table:
+    """Run a query on its own cursor (connections are shared across sessions)."""
+    # .arrow() gives a Table on older DuckDB releases and a RecordBatchReader
+    # on newer ones; pa.table() accepts either
+    return pa.table(con.cursor().execute(sql, params or []).arrow())
+
+
+def as_frame(table: pa.Table) -> pd.DataFrame:
+    """
+    Wrap an Arrow table in Arrow-backed pandas dtypes.
+
+    String columns stay Arrow strings instead of being copied into Python
+    objects.
+    """
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def run_query(con: duckdb.DuckDBPyConnection, sql: str, params: list | None = None) -> pd.DataFrame:
+    """Run a query and return the result as an Arrow-backed DataFrame."""
+    return as_frame(query_arrow(con, sql, params))
+
+
+def table_mtime(table: str) -> float:
+    """Get the modification time of a table's parquet file, for use as a cache key."""
+    return (DATA_DIR / f"{table}.parquet").stat().st_mtime
+
+
+def downsample_minmax(
+    x: np.ndarray, y: np.ndarray, max_points: int = MAX_TREND_POINTS
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a series to at most ``max_points`` points for plotting.
+
+    The series is split into equal-width buckets and only each bucket's
+    minimum and maximum are kept, so peaks and dips survive downsampling.
+    """
+    if len(x) <= max_points:
+        return x, y
+
+    edges = np.linspace(0, len(x), max_points // 2 + 1).astype(np.int64)
+    keep = []
+    for start, end in zip(edges[:-1], edges[1:], strict=True):
+        bucket = y[start:end]
+        # Empty and all-NaN buckets have no extremes to keep
+        if len(bucket) == 0 or np.isnan(bucket).all():
+            continue
+        keep.extend((start + np.nanargmin(bucket), start + np.nanargmax(bucket)))
+    keep = np.unique(np.asarray(keep, dtype=np.int64))
+    return x[keep], y[keep]
 
 
 def format_number(value: float, precision: int = 0) -> str:
@@ -96,15 +203,32 @@ def format_percentage(value: float) -> str:
     return f"{value:.1%}"
 
 
-def render_kpi_metrics(data: dict[str, pd.DataFrame]) -> None:
-    """Render KPI metric cards."""
+def fetch_kpi_days(con: duckdb.DuckDBPyConnection) -> pd.DataFrame:
+    """Fetch the metrics of the two most recent days, oldest first."""
+    return run_query(
+        con,
+        """
+        SELECT * FROM (
+            SELECT unique_users, unique_sessions, total_revenue, purchases, event_date
+            FROM fct_daily_metrics
+            ORDER BY event_date DESC
+            LIMIT 2
+        )
+        ORDER BY event_date
+        """,
+    )
+
+
+def render_kpi_metrics(con: duckdb.DuckDBPyConnection, df: pd.DataFrame | None = None) -> None:
+    """Render KPI metric cards (from prefetched rows if given)."""
     st.header("📈 Key Performance Indicators")
 
-    if "fct_daily_metrics" not in data:
+    if "fct_daily_metrics" not in list_tables(con):
         st.info("Daily metrics data not available. Run the ETL pipeline first.")
         return
 
-    df = data["fct_daily_metrics"]
+    if df is None:
+        df = fetch_kpi_days(con)
 
     # Get latest day and comparison
     latest = df.iloc[-1] if len(df) > 0 else None
@@ -159,32 +283,9 @@ def render_kpi_metrics(data: dict[str, pd.DataFrame]) -> None:
         )
 
 
-def render_engagement_trends(data: dict[str, pd.DataFrame]) -> None:
-    """Render engagement trend charts."""
-    st.header("📊 Engagement Trends")
-
-    if "fct_daily_metrics" not in data:
-        return
-
-    df = data["fct_daily_metrics"].copy()
-    df["event_date"] = pd.to_datetime(df["event_date"])
-
-    # Date range selector
-    col1, col2 = st.columns(2)
-    with col1:
-        date_range = st.selectbox(
-            "Date Range",
-            ["Last 7 Days", "Last 14 Days", "Last 30 Days", "All Time"],
-        )
-
-    # Filter by date range
-    if date_range == "Last 7 Days":
-        df = df[df["event_date"] >= df["event_date"].max() - timedelta(days=7)]
-    elif date_range == "Last 14 Days":
-        df = df[df["event_date"] >= df["event_date"].max() - timedelta(days=14)]
-    elif date_range == "Last 30 Days":
-        df = df[df["event_date"] >= df["event_date"].max() - timedelta(days=30)]
-
+@st.cache_data
+def build_engagement_figure(_df: pd.DataFrame, mtime: float, days: int | None) -> go.Figure:
+    """Build the engagement trend subplots."""
     # Create subplot
     fig = make_subplots(
         rows=2,
@@ -200,8 +301,6 @@ def render_engagement_trends(data: dict[str, pd.DataFrame]) -> None:
     # DAU
     fig.add_trace(
         go.Scatter(
-            x=df["event_date"],
-            y=df["unique_users"],
             mode="lines+markers",
             name="DAU",
             line=dict(color="#1f77b4"),
@@ -213,8 +312,6 @@ def render_engagement_trends(data: dict[str, pd.DataFrame]) -> None:
     # Revenue
     fig.add_trace(
         go.Bar(
-            x=df["event_date"],
-            y=df["total_revenue"],
             name="Revenue",
             marker_color="#2ca02c",
         ),
@@ -225,8 +322,6 @@ def render_engagement_trends(data: dict[str, pd.DataFrame]) -> None:
     # Sessions
     fig.add_trace(
         go.Scatter(
-            x=df["event_date"],
-            y=df["unique_sessions"],
             mode="lines",
             name="Sessions",
             fill="tozeroy",
@@ -237,11 +332,8 @@ def render_engagement_trends(data: dict[str, pd.DataFrame]) -> None:
     )
 
     # Conversion Rate
-    df["conversion_rate"] = df["purchases"] / df["unique_sessions"].replace(0, 1)
     fig.add_trace(
         go.Scatter(
-            x=df["event_date"],
-            y=df["conversion_rate"],
             mode="lines+markers",
             name="Conversion",
             line=dict(color="#d62728"),
@@ -251,52 +343,139 @@ def render_engagement_trends(data: dict[str, pd.DataFrame]) -> None:
     )
 
     fig.update_layout(height=600, showlegend=False)
+    update_engagement_figure(fig, _df)
+    return fig
+
+
+def update_engagement_figure(fig: go.Figure, df: pd.DataFrame) -> None:
+    """Replace the trace data of an engagement figure in place."""
+    event_date = df["event_date"].to_numpy()
+    with fig.batch_update():
+        for trace, column in zip(fig.data, ENGAGEMENT_METRICS, strict=True):
+            trace.x, trace.y = downsample_minmax(event_date, df[column].to_numpy())
+
+
+def fetch_engagement_trends(con: duckdb.DuckDBPyConnection, days: int | None) -> pd.DataFrame:
+    """Fetch the daily engagement metrics of the last ``days`` days (all if None)."""
+    # Filter by date range in DuckDB
+    date_filter = (
+        "WHERE event_date >= (SELECT MAX(event_date) FROM fct_daily_metrics) - ?::INTEGER"
+        if days is not None
+        else ""
+    )
+    return run_query(
+        con,
+        f"""
+        SELECT
+            CAST(event_date AS TIMESTAMP) AS event_date,
+            unique_users,
+            total_revenue,
+            unique_sessions,
+            purchases / IF(unique_sessions = 0, 1, unique_sessions) AS conversion_rate
+        FROM fct_daily_metrics
+        {date_filter}
+        ORDER BY event_date
+        """,
+        [days] if days is not None else None,
+    )
+
+
+def render_engagement_trends(
+    con: duckdb.DuckDBPyConnection, df: pd.DataFrame | None = None
+) -> None:
+    """Render engagement trend charts (from prefetched trends if given)."""
+    st.header("📊 Engagement Trends")
+
+    if "fct_daily_metrics" not in list_tables(con):
+        return
+
+    # Date range selector
+    col1, col2 = st.columns(2)
+    with col1:
+        date_range = st.selectbox("Date Range", list(DATE_RANGE_DAYS), key="engagement_date_range")
+
+    days = DATE_RANGE_DAYS[date_range]
+    if df is None:
+        df = fetch_engagement_trends(con, days)
+
+    # Build the subplot grid once per session; later reruns (e.g. a new date
+    # range) only swap the trace data, which the chart diffs instead of redrawing
+    fig = st.session_state.get("engagement_fig")
+    if fig is None:
+        fig = build_engagement_figure(df, table_mtime("fct_daily_metrics"), days)
+        st.session_state["engagement_fig"] = fig
+    else:
+        update_engagement_figure(fig, df)
+
     st.plotly_chart(fig, use_container_width=True)
 
 
-def render_funnel_analysis(data: dict[str, pd.DataFrame]) -> None:
+@st.cache_data
+def build_funnel_figure(_funnel_df: pd.DataFrame, mtime: float) -> go.Figure:
+    """Build the conversion funnel chart."""
+    fig = go.Figure(
+        go.Funnel(
+            y=_funnel_df["Stage"],
+            x=_funnel_df["Count"],
+            textposition="inside",
+            textinfo="value+percent initial",
+            marker=dict(color=["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd"]),
+        )
+    )
+    fig.update_layout(title="Conversion Funnel", height=400)
+    return fig
+
+
+@st.cache_data
+def get_funnel_df(_con: duckdb.DuckDBPyConnection, mtime: float) -> pa.Table:
+    """Build the funnel stage table over all days."""
+    # Checkout falls back to purchases if not tracked
+    checkout_col = (
+        "checkout_starts"
+        if "checkout_starts" in table_columns(_con, "fct_daily_metrics")
+        else "purchases"
+    )
+    # SUM over no rows is NULL; count those stages as zero
+    totals = query_arrow(
+        _con,
+        f"""
+        SELECT
+            COALESCE(SUM(page_views), 0)::BIGINT AS page_views,
+            COALESCE(SUM(product_views), 0)::BIGINT AS product_views,
+            COALESCE(SUM(add_to_carts), 0)::BIGINT AS add_to_carts,
+            COALESCE(SUM({checkout_col}), 0)::BIGINT AS checkouts,
+            COALESCE(SUM(purchases), 0)::BIGINT AS purchases
+        FROM fct_daily_metrics
+        """,
+    )
+    counts = np.array([column[0].as_py() for column in totals.columns], dtype=np.int64)
+
+    return pa.table(
+        {
+            "Stage": ["Page Views", "Product Views", "Add to Cart", "Checkout", "Purchase"],
+            "Count": counts,
+            # Calculate conversion rates
+            "Conversion Rate": counts / counts[0],
+        }
+    )
+
+
+def render_funnel_analysis(con: duckdb.DuckDBPyConnection) -> None:
     """Render conversion funnel visualization."""
     st.header("🔄 Conversion Funnel")
 
-    if "fct_daily_metrics" not in data:
+    if "fct_daily_metrics" not in list_tables(con):
         return
 
-    df = data["fct_daily_metrics"]
-
     # Aggregate funnel metrics
-    funnel_data = {
-        "Stage": ["Page Views", "Product Views", "Add to Cart", "Checkout", "Purchase"],
-        "Count": [
-            df["page_views"].sum(),
-            df["product_views"].sum(),
-            df["add_to_carts"].sum(),
-            df.get("checkout_starts", df["purchases"]).sum(),
-            df["purchases"].sum(),
-        ],
-    }
-
-    funnel_df = pd.DataFrame(funnel_data)
-
-    # Calculate conversion rates
-    funnel_df["Conversion Rate"] = funnel_df["Count"] / funnel_df["Count"].iloc[0]
+    mtime = table_mtime("fct_daily_metrics")
+    funnel_df = as_frame(get_funnel_df(con, mtime))
 
     col1, col2 = st.columns([2, 1])
 
     with col1:
         # Funnel chart
-        fig = go.Figure(
-            go.Funnel(
-                y=funnel_df["Stage"],
-                x=funnel_df["Count"],
-                textposition="inside",
-                textinfo="value+percent initial",
-                marker=dict(
-                    color=["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd"]
-                ),
-            )
-        )
-        fig.update_layout(title="Conversion Funnel", height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_funnel_figure(funnel_df, mtime), use_container_width=True)
 
     with col2:
         st.subheader("Stage Metrics")
@@ -312,90 +491,159 @@ def render_funnel_analysis(data: dict[str, pd.DataFrame]) -> None:
             )
 
 
-def render_product_performance(data: dict[str, pd.DataFrame]) -> None:
+@st.cache_data
+def build_top_products_figure(_top_products: pd.DataFrame, mtime: float) -> go.Figure:
+    """Build the top-products-by-revenue bar chart."""
+    import plotly.express as px
+
+    fig = px.bar(
+        _top_products,
+        x="total_revenue",
+        y="category",
+        orientation="h",
+        color="purchases",
+        color_continuous_scale="Blues",
+    )
+    fig.update_layout(height=400)
+    return fig
+
+
+@st.cache_data
+def build_category_conversion_figure(_category_conv: pd.DataFrame, mtime: float) -> go.Figure:
+    """Build the conversion-rate-by-category bar chart."""
+    import plotly.express as px
+
+    fig = px.bar(
+        _category_conv,
+        x="category",
+        y="conversion_rate",
+        color="conversion_rate",
+        color_continuous_scale="Greens",
+    )
+    fig.update_layout(height=400)
+    return fig
+
+
+@st.cache_data
+def get_category_conversion(_con: duckdb.DuckDBPyConnection, mtime: float) -> pa.Table:
+    """Top categories by conversion rate."""
+    return query_arrow(
+        _con,
+        """
+        SELECT
+            category,
+            SUM(view_count)::BIGINT AS view_count,
+            SUM(purchases)::BIGINT AS purchases,
+            SUM(purchases) / IF(SUM(view_count) = 0, 1, SUM(view_count)) AS conversion_rate
+        FROM fct_product_performance
+        GROUP BY category
+        ORDER BY conversion_rate DESC
+        LIMIT 10
+        """,
+    )
+
+
+def render_product_performance(con: duckdb.DuckDBPyConnection) -> None:
     """Render product performance analysis."""
     st.header("📦 Product Performance")
 
-    if "fct_product_performance" not in data:
+    if "fct_product_performance" not in list_tables(con):
         st.info("Product performance data not available.")
         return
 
-    df = data["fct_product_performance"]
-
+    mtime = table_mtime("fct_product_performance")
     col1, col2 = st.columns(2)
 
     with col1:
         # Top products by revenue
         st.subheader("Top Products by Revenue")
-        top_products = df.nlargest(10, "total_revenue")[
-            ["category", "total_revenue", "purchases"]
-        ]
-
-        fig = px.bar(
-            top_products,
-            x="total_revenue",
-            y="category",
-            orientation="h",
-            color="purchases",
-            color_continuous_scale="Blues",
+        top_products = run_query(
+            con,
+            """
+            SELECT category, total_revenue, purchases
+            FROM fct_product_performance
+            ORDER BY total_revenue DESC
+            LIMIT 10
+            """,
         )
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
 
+        st.plotly_chart(build_top_products_figure(top_products, mtime), use_container_width=True)
     with col2:
         # Conversion by category
         st.subheader("Conversion Rate by Category")
-        category_conv = (
-            df.groupby("category")
-            .agg({"view_count": "sum", "purchases": "sum"})
-            .reset_index()
-        )
-        category_conv["conversion_rate"] = (
-            category_conv["purchases"] / category_conv["view_count"].replace(0, 1)
-        )
+        category_conv = as_frame(get_category_conversion(con, mtime))
 
-        fig = px.bar(
-            category_conv.nlargest(10, "conversion_rate"),
-            x="category",
-            y="conversion_rate",
-            color="conversion_rate",
-            color_continuous_scale="Greens",
+        st.plotly_chart(
+            build_category_conversion_figure(category_conv, mtime), use_container_width=True
         )
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
 
 
-def render_session_analysis(data: dict[str, pd.DataFrame]) -> None:
+@st.cache_data
+def get_session_counts(_con: duckdb.DuckDBPyConnection, mtime: float, column: str) -> pa.Table:
+    """Session counts per value of a column."""
+    return query_arrow(
+        _con,
+        f"""
+        SELECT {column}, COUNT(*) AS sessions
+        FROM fct_sessions
+        WHERE {column} IS NOT NULL
+        GROUP BY {column}
+        ORDER BY sessions DESC
+        """,
+    )
+
+
+@st.cache_data
+def get_duration_histogram(_con: duckdb.DuckDBPyConnection, mtime: float) -> pa.Table:
+    """Bin session durations in DuckDB so only the bin counts reach the browser."""
+    return query_arrow(
+        _con,
+        """
+        SELECT
+            FLOOR(session_duration_seconds * ? / ?)::INTEGER AS bin,
+            COUNT(*) AS sessions
+        FROM fct_sessions
+        WHERE session_duration_seconds >= 0 AND session_duration_seconds < ?
+        GROUP BY bin
+        ORDER BY bin
+        """,
+        [DURATION_BINS, MAX_SESSION_SECONDS, MAX_SESSION_SECONDS],
+    )
+
+
+def render_session_analysis(con: duckdb.DuckDBPyConnection) -> None:
     """Render session behavior analysis."""
+    import plotly.express as px
+
     st.header("👥 Session Analysis")
 
-    if "fct_sessions" not in data:
+    if "fct_sessions" not in list_tables(con):
         st.info("Session data not available.")
         return
 
-    df = data["fct_sessions"]
-
     col1, col2 = st.columns(2)
 
     with col1:
         # Session duration distribution
         st.subheader("Session Duration Distribution")
-        fig = px.histogram(
-            df[df["session_duration_seconds"] < 3600],
-            x="session_duration_seconds",
-            nbins=50,
-            labels={"session_duration_seconds": "Duration (seconds)"},
+        bins = as_frame(get_duration_histogram(con, table_mtime("fct_sessions")))
+        bin_width = MAX_SESSION_SECONDS / DURATION_BINS
+        fig = px.bar(
+            x=(bins["bin"] + 0.5) * bin_width,
+            y=bins["sessions"],
+            labels={"x": "Duration (seconds)", "y": "count"},
         )
-        fig.update_layout(height=350)
+        fig.update_traces(width=bin_width)
+        fig.update_layout(height=350, bargap=0)
         st.plotly_chart(fig, use_container_width=True)
 
     with col2:
         # Device breakdown
         st.subheader("Sessions by Device")
-        device_counts = df["devices"].value_counts()
+        device_counts = as_frame(get_session_counts(con, table_mtime("fct_sessions"), "devices"))
         fig = px.pie(
-            values=device_counts.values,
-            names=device_counts.index,
+            values=device_counts["sessions"],
+            names=device_counts["devices"],
             hole=0.4,
         )
         fig.update_layout(height=350)
@@ -403,37 +651,57 @@ def render_session_analysis(data: dict[str, pd.DataFrame]) -> None:
 
     # Session quality breakdown
     st.subheader("Session Quality Distribution")
-    if "session_quality" in df.columns:
-        quality_counts = df["session_quality"].value_counts()
+    if "session_quality" in table_columns(con, "fct_sessions"):
+        quality_counts = as_frame(
+            get_session_counts(con, table_mtime("fct_sessions"), "session_quality")
+        )
         fig = px.bar(
-            x=quality_counts.index,
-            y=quality_counts.values,
+            x=quality_counts["session_quality"],
+            y=quality_counts["sessions"],
             labels={"x": "Quality Tier", "y": "Session Count"},
-            color=quality_counts.values,
+            color=quality_counts["sessions"],
             color_continuous_scale="Viridis",
         )
         st.plotly_chart(fig, use_container_width=True)
 
 
-def render_traffic_analysis(data: dict[str, pd.DataFrame]) -> None:
+@st.cache_data
+def get_traffic_by_source(_con: duckdb.DuckDBPyConnection, mtime: float) -> pa.Table:
+    """Event counts and revenue per traffic source."""
+    # One pass over fct_events serves both charts
+    return query_arrow(
+        _con,
+        """
+        SELECT traffic_source, COUNT(*) AS events, SUM(revenue) AS revenue
+        FROM fct_events
+        WHERE traffic_source IS NOT NULL
+        GROUP BY traffic_source
+        ORDER BY traffic_source
+        """,
+    )
+
+
+def render_traffic_analysis(con: duckdb.DuckDBPyConnection) -> None:
     """Render traffic source analysis."""
+    import plotly.express as px
+
     st.header("🚦 Traffic Analysis")
 
-    if "fct_events" not in data:
+    if "fct_events" not in list_tables(con):
         st.info("Event data not available.")
         return
 
-    df = data["fct_events"]
+    by_source = as_frame(get_traffic_by_source(con, table_mtime("fct_events")))
 
     col1, col2 = st.columns(2)
 
     with col1:
         # Traffic source breakdown
         st.subheader("Events by Traffic Source")
-        source_counts = df["traffic_source"].value_counts()
+        source_counts = by_source.sort_values("events", ascending=False)
         fig = px.pie(
-            values=source_counts.values,
-            names=source_counts.index,
+            values=source_counts["events"],
+            names=source_counts["traffic_source"],
             hole=0.3,
         )
         fig.update_layout(height=350)
@@ -442,9 +710,8 @@ def render_traffic_analysis(data: dict[str, pd.DataFrame]) -> None:
     with col2:
         # Revenue by traffic source
         st.subheader("Revenue by Traffic Source")
-        revenue_by_source = df.groupby("traffic_source")["revenue"].sum().reset_index()
         fig = px.bar(
-            revenue_by_source,
+            by_source,
             x="traffic_source",
             y="revenue",
             color="revenue",
@@ -473,9 +740,9 @@ def main():
         ],
     )
 
-    # Load data
+    # Connect to data
     try:
-        data = load_data()
+        con = get_connection()
     except Exception as e:
         st.error(f"Error loading data: {e}")
         st.info(
@@ -488,30 +755,42 @@ def main():
         )
         return
 
-    if not data:
+    if not list_tables(con):
         st.warning("No data available. Please run the ETL pipeline first.")
         return
 
     # Render selected page
     if page == "📈 Overview":
-        render_kpi_metrics(data)
+        kpi_days = trends = None
+        if "fct_daily_metrics" in list_tables(con):
+            # Query both sections concurrently; widgets and charts stay on the
+            # script thread. The selectbox value is read ahead of the widget.
+            date_range = st.session_state.get("engagement_date_range", next(iter(DATE_RANGE_DAYS)))
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                kpi_future = executor.submit(fetch_kpi_days, con)
+                trends_future = executor.submit(
+                    fetch_engagement_trends, con, DATE_RANGE_DAYS[date_range]
+                )
+            kpi_days, trends = kpi_future.result(), trends_future.result()
+
+        render_kpi_metrics(con, kpi_days)
         st.markdown("---")
-        render_engagement_trends(data)
+        render_engagement_trends(con, trends)
 
     elif page == "📊 Engagement Trends":
-        render_engagement_trends(data)
+        render_engagement_trends(con)
 
     elif page == "🔄 Funnel Analysis":
-        render_funnel_analysis(data)
+        render_funnel_analysis(con)
 
     elif page == "📦 Product Performance":
-        render_product_performance(data)
+        render_product_performance(con)
 
     elif page == "👥 Session Analysis":
-        render_session_analysis(data)
+        render_session_analysis(con)
 
     elif page == "🚦 Traffic Analysis":
-        render_traffic_analysis(data)
+        render_traffic_analysis(con)
 
     # Footer
     st.sidebar.markdown("---")
@@ -13,11 +13,38 @@ Usage:
 import json
 from datetime import datetime
 from enum import Enum
-from typing import Any, Literal
+from typing import Any, Literal, get_args
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+try:
+    from scripts.utils import json_loads
+except ImportError:  # run directly as a script from scripts/
+    from utils import json_loads
+
+# ID formats as (prefix, hex digit count), shared by the Pydantic schemas
+# (as regex patterns) and the vectorized validators (as byte checks)
+EVENT_ID_FORMAT = ("EVT_", 16)
+USER_ID_FORMAT = ("USER_", 12)
+SESSION_ID_FORMAT = ("SES_", 16)
+PRODUCT_ID_FORMAT = ("PROD_", 8)
+
+
+def _hex_id_pattern(id_format: tuple[str, int]) -> str:
+    """Build the anchored regex for an ID format."""
+    prefix, digits = id_format
+    return rf"^{prefix}[A-F0-9]{{{digits}}}$"
+
+
+EVENT_ID_PATTERN = _hex_id_pattern(EVENT_ID_FORMAT)
+USER_ID_PATTERN = _hex_id_pattern(USER_ID_FORMAT)
+SESSION_ID_PATTERN = _hex_id_pattern(SESSION_ID_FORMAT)
+PRODUCT_ID_PATTERN = _hex_id_pattern(PRODUCT_ID_FORMAT)
+
 
 class EventTypeEnum(str, Enum):
     """Valid event types in the e-commerce platform."""
@@ -52,6 +79,12 @@ class TrafficSource(str, Enum):
     REFERRAL = "referral"
 
 
+# Enum value sets, built once for the vectorized validators
+_EVENT_TYPES = frozenset(e.value for e in EventTypeEnum)
+_DEVICES = frozenset(e.value for e in DeviceType)
+_SOURCES = frozenset(e.value for e in TrafficSource)
+
+
 class EventSchema(BaseModel):
     """
     Schema definition for e-commerce events.
@@ -65,16 +98,16 @@ class EventSchema(BaseModel):
 
     model_config = ConfigDict(str_strip_whitespace=True)
 
-    event_id: str = Field(..., min_length=20, max_length=24, pattern=r"^EVT_[A-F0-9]{16}$")
+    event_id: str = Field(..., min_length=20, max_length=24, pattern=EVENT_ID_PATTERN)
     event_type: EventTypeEnum
-    user_id: str = Field(..., min_length=17, max_length=17, pattern=r"^USER_[A-F0-9]{12}$")
-    session_id: str = Field(..., min_length=20, max_length=24, pattern=r"^SES_[A-F0-9]{16}$")
+    user_id: str = Field(..., min_length=17, max_length=17, pattern=USER_ID_PATTERN)
+    session_id: str = Field(..., min_length=20, max_length=24, pattern=SESSION_ID_PATTERN)
     timestamp: datetime
     properties: dict[str, Any] | str
     device: DeviceType | None = None
     country: str | None = Field(None, min_length=2, max_length=2)
     traffic_source: TrafficSource | None = None
-    product_id: str | None = Field(None, pattern=r"^PROD_[A-F0-9]{8}$")
+    product_id: str | None = Field(None, pattern=PRODUCT_ID_PATTERN)
     category: str | None = None
     revenue: float = Field(default=0.0, ge=0.0, le=100000.0)
 
@@ -103,7 +136,7 @@ class ProductSchema(BaseModel):
 
     model_config = ConfigDict(str_strip_whitespace=True)
 
-    product_id: str = Field(..., pattern=r"^PROD_[A-F0-9]{8}$")
+    product_id: str = Field(..., pattern=PRODUCT_ID_PATTERN)
     product_name: str = Field(..., min_length=1, max_length=200)
     category: str = Field(..., min_length=1, max_length=100)
     subcategory: str | None = None
@@ -119,7 +152,7 @@ class UserSchema(BaseModel):
 
     model_config = ConfigDict(str_strip_whitespace=True)
 
-    user_id: str = Field(..., pattern=r"^USER_[A-F0-9]{12}$")
+    user_id: str = Field(..., pattern=USER_ID_PATTERN)
     segment: Literal["power_buyer", "browser", "occasional", "new_user"]
     primary_device: DeviceType
     traffic_source: TrafficSource
@@ -130,6 +163,9 @@ class UserSchema(BaseModel):
     lifetime_value: float = Field(default=0.0, ge=0.0)
 
 
+_SEGMENTS = frozenset(get_args(UserSchema.model_fields["segment"].annotation))
+
+
 class ValidationResult(BaseModel):
     """Result of a validation run."""
 
@@ -147,6 +183,232 @@ class ValidationResult(BaseModel):
         return self.valid_records / self.total_records * 100
 
 
+# Byte lookup table of the characters allowed in an ID's hex suffix
+_HEX_DIGITS = np.zeros(256, dtype=bool)
+_HEX_DIGITS[np.frombuffer(b"0123456789ABCDEF", dtype=np.uint8)] = True
+
+
+def _hex_id_mask(values: pd.Series, prefix: str, digits: int) -> pd.Series:
+    """
+    Check ``^<prefix>[A-F0-9]{<digits>}$`` without a regex engine.
+
+    Strings of the expected byte length are packed by Arrow into one
+    contiguous buffer, viewed as a (rows, width) uint8 matrix: the prefix
+    becomes a row-wise equality test and the suffix a lookup-table gather.
+    """
+    width = len(prefix) + digits
+    array = pa.array(values, type=pa.large_string(), from_pandas=True)
+    if isinstance(array, pa.ChunkedArray):
+        # Arrow-backed columns can be chunked (e.g. after a concat)
+        array = array.combine_chunks()
+    candidates = pc.fill_null(pc.equal(pc.binary_length(array), width), False)
+    fixed = pc.filter(array, candidates)
+
+    mask = np.zeros(len(values), dtype=bool)
+    if len(fixed) > 0:
+        _, offsets_buffer, data_buffer = fixed.buffers()
+        offsets = np.frombuffer(offsets_buffer, dtype=np.int64)
+        start, end = offsets[fixed.offset], offsets[fixed.offset + len(fixed)]
+        rows = np.frombuffer(data_buffer, dtype=np.uint8)[start:end].reshape(-1, width)
+
+        prefix_bytes = np.frombuffer(prefix.encode(), dtype=np.uint8)
+        valid = (rows[:, : len(prefix)] == prefix_bytes).all(axis=1)
+        valid &= _HEX_DIGITS[rows[:, len(prefix) :]].all(axis=1)
+        mask[candidates.to_numpy(zero_copy_only=False)] = valid
+
+    return pd.Series(mask, index=values.index)
+
+
+def _string_mask(
+    df: pd.DataFrame,
+    column: str,
+    hex_id: tuple[str, int] | None = None,
+    min_length: int | None = None,
+    max_length: int | None = None,
+    required: bool = True,
+) -> pd.Series:
+    """Vectorized equivalent of a constrained Pydantic ``str`` field."""
+    if column not in df.columns:
+        return pd.Series(not required, index=df.index)
+
+    values = df[column]
+    is_null = values.isna()
+    try:
+        # Non-string values become NaN, mirroring Pydantic's strict str check
+        stripped = values.str.strip()
+    except AttributeError:
+        return is_null if not required else pd.Series(False, index=df.index)
+
+    mask = stripped.notna()
+    if hex_id is not None:
+        mask &= _hex_id_mask(stripped, *hex_id)
+    if min_length is not None or max_length is not None:
+        lengths = stripped.str.len()
+        if min_length is not None:
+            mask &= lengths >= min_length
+        if max_length is not None:
+            mask &= lengths <= max_length
+
+    return mask | is_null if not required else mask
+
+
+def _choice_mask(
+    df: pd.DataFrame,
+    column: str,
+    choices: frozenset[str],
+    required: bool = True,
+) -> pd.Series:
+    """Vectorized equivalent of an Enum/Literal field."""
+    if column not in df.columns:
+        return pd.Series(not required, index=df.index)
+
+    mask = df[column].isin(choices)
+    return mask | df[column].isna() if not required else mask
+
+
+def _number_mask(
+    df: pd.DataFrame,
+    column: str,
+    ge: float | None = None,
+    gt: float | None = None,
+    le: float | None = None,
+    integer: bool = False,
+    required: bool = True,
+    has_default: bool = False,
+) -> pd.Series:
+    """Vectorized equivalent of a bounded Pydantic ``float``/``int`` field."""
+    if column not in df.columns:
+        return pd.Series(has_default or not required, index=df.index)
+
+    values = pd.to_numeric(df[column], errors="coerce")
+    mask = values.notna()
+    if ge is not None:
+        mask &= values >= ge
+    if gt is not None:
+        mask &= values > gt
+    if le is not None:
+        mask &= values <= le
+    if integer:
+        mask &= values % 1 == 0
+
+    return mask | df[column].isna() if not required else mask
+
+
+def _bool_mask(df: pd.DataFrame, column: str) -> pd.Series:
+    """Vectorized equivalent of a ``bool`` field with a default."""
+    if column not in df.columns:
+        return pd.Series(True, index=df.index)
+    return df[column].isin([True, False])
+
+
+def _datetime_mask(df: pd.DataFrame, column: str) -> pd.Series:
+    """Vectorized equivalent of a required ``datetime`` field."""
+    if column not in df.columns:
+        return pd.Series(False, index=df.index)
+    return pd.to_datetime(df[column], errors="coerce", format="ISO8601", utc=True).notna()
+
+
+def _is_json_object(value: Any) -> bool:
+    """Check that a properties value is a dict or a JSON string encoding one."""
+    if isinstance(value, dict):
+        return True
+    if isinstance(value, str):
+        try:
+            # Decodes exactly what the schema's json.loads accepts
+            return isinstance(json_loads(value), dict)
+        except json.JSONDecodeError:
+            return False
+    return False
+
+
+def _strip_strings(values: pd.Series) -> pd.Series:
+    """Strip whitespace like ``str_strip_whitespace``, keeping categoricals as such."""
+    if values.empty:
+        return values
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = values.cat.categories
+        stripped = categories.str.strip()
+        if stripped.equals(categories):
+            return values
+        if stripped.is_unique:
+            return values.cat.rename_categories(stripped)
+    elif not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+        # e.g. an optional column that is all-NaN floats: nothing to strip
+        return values
+    return values.str.strip()
+
+
+def _coerce_column(values: pd.Series, annotation: Any) -> pd.Series:
+    """
+    Convert validated values to what Pydantic would have produced for the field.
+
+    The masks accept whatever Pydantic accepts (padded strings, numeric and ISO
+    timestamp strings), so the valid rows are normalised the same way here.
+    Columns that already have the target dtype are returned unchanged.
+    """
+    kinds = {arg for arg in (get_args(annotation) or (annotation,)) if arg is not type(None)}
+    if kinds == {str}:
+        return _strip_strings(values)
+    if kinds and kinds <= {int, float}:
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            return values
+        return pd.to_numeric(values)
+    if kinds == {bool}:
+        if pd.api.types.is_bool_dtype(values):
+            return values
+        # The mask accepts 1/0 and 1.0/0.0, which compare equal to True/False
+        return values.astype(bool)
+    if kinds == {datetime}:
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values
+        try:
+            # Naive strings stay naive and offsets are kept, as in the model
+            return pd.to_datetime(values, format="ISO8601")
+        except ValueError:
+            # Mixed offsets (or naive mixed with aware) have no common zone in
+            # a datetime64 column, so they are converted to UTC
+            return pd.to_datetime(values, format="ISO8601", utc=True)
+    return values
+
+
+def _apply_masks(
+    df: pd.DataFrame,
+    schema: type[BaseModel],
+    masks: dict[str, pd.Series],
+) -> tuple[pd.DataFrame, pd.Series, dict[str, int]]:
+    """
+    Combine per-field masks into the valid subset of a DataFrame.
+
+    Returns the valid rows restricted to the schema's fields (coerced to the
+    field types, with optional fields missing from the input filled with their
+    defaults), the combined validity mask, and the number of failing rows per
+    field.
+    """
+    valid_mask = pd.Series(True, index=df.index)
+    error_summary: dict[str, int] = {}
+    for field_name, mask in masks.items():
+        valid_mask &= mask
+        failures = int((~mask).sum())
+        if failures:
+            error_summary[field_name] = failures
+
+    # Filter each schema column's typed array directly and build the result in
+    # one go, rather than copying every input column and inserting defaults
+    keep = valid_mask.to_numpy()
+    n_valid = int(keep.sum())
+    columns = {}
+    for field_name, field_info in schema.model_fields.items():
+        if field_name in df.columns:
+            values = pd.Series(df[field_name].array[keep], copy=False)
+            columns[field_name] = _coerce_column(values, field_info.annotation)
+        else:
+            default = None if field_info.is_required() else field_info.default
+            columns[field_name] = np.full(n_valid, default)
+    valid_df = pd.DataFrame(columns)
+
+    return valid_df, valid_mask, error_summary
+
+
 def validate_events(
     df: pd.DataFrame,
     raise_on_error: bool = False,
@@ -155,10 +417,13 @@ def validate_events(
     """
     Validate a DataFrame of events against the EventSchema.
 
+    The EventSchema constraints are evaluated as column-wise boolean masks
+    rather than by instantiating the model once per row.
+
     Args:
         df: Input DataFrame with event data
-        raise_on_error: If True, raise exception on first error
-        sample_errors: Number of error samples to collect per error type
+        raise_on_error: If True, raise ValueError if any record is invalid
+        sample_errors: Number of error samples to collect per failing field
 
     Returns:
         Tuple of (validated DataFrame with only valid rows, ValidationResult)
@@ -167,44 +432,39 @@ def validate_events(
         >>> valid_df, result = validate_events(raw_df)
         >>> print(f"Validity rate: {result.validity_rate:.1f}%")
     """
-    valid_records = []
-    invalid_indices = []
-    error_summary: dict[str, int] = {}
-    error_samples: dict[str, list] = {}
-
-    for idx, row in df.iterrows():
-        try:
-            # Convert row to dict and validate
-            record = row.to_dict()
-            validated = EventSchema(**record)
-            valid_records.append(validated.model_dump())
-        except Exception as e:
-            invalid_indices.append(idx)
-            error_type = type(e).__name__
-            error_summary[error_type] = error_summary.get(error_type, 0) + 1
-
-            # Collect sample errors for debugging
-            if error_type not in error_samples:
-                error_samples[error_type] = []
-            if len(error_samples[error_type]) < sample_errors:
-                error_samples[error_type].append(
-                    {"index": idx, "error": str(e), "data": str(row.to_dict())[:200]}
-                )
-
-            if raise_on_error:
-                raise
+    masks = {
+        "event_id": _string_mask(df, "event_id", hex_id=EVENT_ID_FORMAT),
+        "event_type": _choice_mask(df, "event_type", _EVENT_TYPES),
+        "user_id": _string_mask(df, "user_id", hex_id=USER_ID_FORMAT),
+        "session_id": _string_mask(df, "session_id", hex_id=SESSION_ID_FORMAT),
+        "timestamp": _datetime_mask(df, "timestamp"),
+        "properties": (
+            df["properties"].map(_is_json_object).astype(bool)
+            if "properties" in df.columns
+            else pd.Series(False, index=df.index)
+        ),
+        "device": _choice_mask(df, "device", _DEVICES, required=False),
+        "country": _string_mask(df, "country", min_length=2, max_length=2, required=False),
+        "traffic_source": _choice_mask(df, "traffic_source", _SOURCES, required=False),
+        "product_id": _string_mask(df, "product_id", hex_id=PRODUCT_ID_FORMAT, required=False),
+        "category": _string_mask(df, "category", required=False),
+        "revenue": _number_mask(df, "revenue", ge=0.0, le=100000.0, has_default=True),
+    }
+    valid_df, valid_mask, error_summary = _apply_masks(df, EventSchema, masks)
+
+    if raise_on_error and error_summary:
+        field_name = next(iter(error_summary))
+        first_index = masks[field_name].idxmin()
+        raise ValueError(f"Invalid value for '{field_name}' at index {first_index}")
 
     # Create result
     result = ValidationResult(
         total_records=len(df),
-        valid_records=len(valid_records),
-        invalid_records=len(invalid_indices),
+        valid_records=int(valid_mask.sum()),
+        invalid_records=int((~valid_mask).sum()),
         error_summary=error_summary,
     )
 
-    # Create validated DataFrame
-    valid_df = pd.DataFrame(valid_records) if valid_records else pd.DataFrame()
-
     # Log summary
     print(f"\nValidation Summary:")
     print(f"  Total records:   {result.total_records:,}")
@@ -214,62 +474,82 @@ def validate_events(
 
     if error_summary:
         print(f"\nError Summary:")
-        for error_type, count in sorted(error_summary.items(), key=lambda x: -x[1]):
-            print(f"  {error_type}: {count:,}")
+        for field_name, count in sorted(error_summary.items(), key=lambda x: -x[1]):
+            print(f"  {field_name}: {count:,}")
 
         print(f"\nSample Errors:")
-        for error_type, samples in error_samples.items():
-            print(f"\n  {error_type}:")
-            for sample in samples[:2]:
-                print(f"    Index {sample['index']}: {sample['error'][:100]}")
+        for field_name in error_summary:
+            print(f"\n  {field_name}:")
+            failing = df.loc[~masks[field_name], field_name] if field_name in df.columns else None
+            if failing is None:
+                print("    Column missing")
+                continue
+            for idx, value in failing.head(min(sample_errors, 2)).items():
+                print(f"    Index {idx}: {str(value)[:100]!r}")
 
     return valid_df, result
 
 
 def validate_products(df: pd.DataFrame) -> tuple[pd.DataFrame, ValidationResult]:
     """Validate product catalog DataFrame."""
-    valid_records = []
-    error_summary: dict[str, int] = {}
-
-    for _, row in df.iterrows():
-        try:
-            validated = ProductSchema(**row.to_dict())
-            valid_records.append(validated.model_dump())
-        except Exception as e:
-            error_type = type(e).__name__
-            error_summary[error_type] = error_summary.get(error_type, 0) + 1
+    masks = {
+        "product_id": _string_mask(df, "product_id", hex_id=PRODUCT_ID_FORMAT),
+        "product_name": _string_mask(df, "product_name", min_length=1, max_length=200),
+        "category": _string_mask(df, "category", min_length=1, max_length=100),
+        "subcategory": _string_mask(df, "subcategory", required=False),
+        "price": _number_mask(df, "price", gt=0, le=100000),
+        "brand": _string_mask(df, "brand", required=False),
+        "rating": _number_mask(df, "rating", ge=0.0, le=5.0, required=False),
+        "review_count": _number_mask(df, "review_count", ge=0, integer=True, required=False),
+        "in_stock": _bool_mask(df, "in_stock"),
+    }
+    valid_df, valid_mask, error_summary = _apply_masks(df, ProductSchema, masks)
 
     result = ValidationResult(
         total_records=len(df),
-        valid_records=len(valid_records),
-        invalid_records=len(df) - len(valid_records),
+        valid_records=int(valid_mask.sum()),
+        invalid_records=int((~valid_mask).sum()),
         error_summary=error_summary,
     )
 
-    return pd.DataFrame(valid_records) if valid_records else pd.DataFrame(), result
+    return valid_df, result
 
 
 def validate_users(df: pd.DataFrame) -> tuple[pd.DataFrame, ValidationResult]:
     """Validate user profiles DataFrame."""
-    valid_records = []
-    error_summary: dict[str, int] = {}
-
-    for _, row in df.iterrows():
-        try:
-            validated = UserSchema(**row.to_dict())
-            valid_records.append(validated.model_dump())
-        except Exception as e:
-            error_type = type(e).__name__
-            error_summary[error_type] = error_summary.get(error_type, 0) + 1
+    masks = {
+        "user_id": _string_mask(df, "user_id", hex_id=USER_ID_FORMAT),
+        "segment": _choice_mask(df, "segment", _SEGMENTS),
+        "primary_device": _choice_mask(df, "primary_device", _DEVICES),
+        "traffic_source": _choice_mask(df, "traffic_source", _SOURCES),
+        "country": _string_mask(df, "country", min_length=2, max_length=2),
+        "city": _string_mask(df, "city", required=False),
+        "created_at": _datetime_mask(df, "created_at"),
+        "is_subscribed": _bool_mask(df, "is_subscribed"),
+        "lifetime_value": _number_mask(df, "lifetime_value", ge=0.0, has_default=True),
+    }
+    valid_df, valid_mask, error_summary = _apply_masks(df, UserSchema, masks)
 
     result = ValidationResult(
         total_records=len(df),
-        valid_records=len(valid_records),
-        invalid_records=len(df) - len(valid_records),
+        valid_records=int(valid_mask.sum()),
+        invalid_records=int((~valid_mask).sum()),
         error_summary=error_summary,
     )
 
-    return pd.DataFrame(valid_records) if valid_records else pd.DataFrame(), result
+    return valid_df, result
+
+
+def _value_counts(values: pd.Series, dropna: bool = False) -> np.ndarray:
+    """Count the occurrences of each distinct value, hashing on Arrow buffers."""
+    try:
+        array = pa.array(values, from_pandas=True)
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        # Object columns mixing types (e.g. str and int) have no Arrow type
+        return values.value_counts(dropna=dropna).to_numpy()
+    if dropna:
+        array = pc.drop_null(array)
+    return pc.value_counts(array).field("counts").to_numpy()
 
 
 class DataQualityChecker:
@@ -288,52 +568,63 @@ class DataQualityChecker:
         self.df = events_df
         self.issues: list[dict[str, Any]] = []
 
+        # Parse timestamps once so time-based checks compare datetime64 values
+        self._timestamps: pd.Series | None = (
+            pd.to_datetime(events_df["timestamp"], errors="coerce")
+            if "timestamp" in events_df.columns
+            else None
+        )
+
     def check_duplicates(self) -> "DataQualityChecker":
         """Check for duplicate event IDs."""
-        duplicates = self.df[self.df.duplicated(subset=["event_id"], keep=False)]
-        if len(duplicates) > 0:
+        # Every row whose ID occurs more than once, like duplicated(keep=False)
+        counts = _value_counts(self.df["event_id"])
+        n_duplicates = int(counts[counts > 1].sum())
+        if n_duplicates > 0:
             self.issues.append(
                 {
                     "check": "duplicates",
                     "severity": "high",
-                    "count": len(duplicates),
-                    "message": f"Found {len(duplicates)} duplicate event IDs",
+                    "count": n_duplicates,
+                    "message": f"Found {n_duplicates} duplicate event IDs",
                 }
             )
         return self
 
     def check_null_rates(self, threshold: float = 0.1) -> "DataQualityChecker":
         """Check null rates for each column."""
-        for col in self.df.columns:
-            null_rate = self.df[col].isnull().sum() / len(self.df)
-            if null_rate > threshold:
-                self.issues.append(
-                    {
-                        "check": "null_rate",
-                        "severity": "medium",
-                        "column": col,
-                        "null_rate": null_rate,
-                        "message": f"Column '{col}' has {null_rate:.1%} null values",
-                    }
-                )
+        null_rates = self.df.isnull().mean()
+        for col, null_rate in null_rates[null_rates > threshold].items():
+            self.issues.append(
+                {
+                    "check": "null_rate",
+                    "severity": "medium",
+                    "column": col,
+                    "null_rate": float(null_rate),
+                    "message": f"Column '{col}' has {null_rate:.1%} null values",
+                }
+            )
         return self
 
     def check_revenue_outliers(self, z_threshold: float = 3.0) -> "DataQualityChecker":
         """Check for revenue outliers using z-score."""
-        revenue = self.df[self.df["revenue"] > 0]["revenue"]
-        if len(revenue) > 0:
+        revenue = self.df["revenue"].to_numpy(dtype=np.float64, na_value=np.nan)
+        revenue = revenue[revenue > 0]
+        if len(revenue) > 1:
             mean = revenue.mean()
-            std = revenue.std()
+            std = revenue.std(ddof=1)
             if std > 0:
-                z_scores = (revenue - mean) / std
-                outliers = revenue[abs(z_scores) > z_threshold]
+                # |x - mean| > z * std, computed in place without a z-score array
+                deviation = np.subtract(revenue, mean)
+                np.abs(deviation, out=deviation)
+                outliers = revenue[deviation > z_threshold * std]
                 if len(outliers) > 0:
                     self.issues.append(
                         {
                             "check": "revenue_outliers",
                             "severity": "low",
                             "count": len(outliers),
-                            "max_value": outliers.max(),
+                            "max_value": float(outliers.max()),
                             "message": f"Found {len(outliers)} revenue outliers",
                         }
                     )
@@ -341,30 +632,33 @@ class DataQualityChecker:
 
     def check_temporal_order(self) -> "DataQualityChecker":
         """Check for events with timestamps in the future."""
-        now = datetime.now()
-        future_events = self.df[pd.to_datetime(self.df["timestamp"]) > now]
-        if len(future_events) > 0:
+        if self._timestamps is None:
+            return self
+
+        now = pd.Timestamp.now(tz=self._timestamps.dt.tz)
+        n_future = int((self._timestamps > now).sum())
+        if n_future > 0:
             self.issues.append(
                 {
                     "check": "future_timestamps",
                     "severity": "high",
-                    "count": len(future_events),
-                    "message": f"Found {len(future_events)} events with future timestamps",
+                    "count": n_future,
+                    "message": f"Found {n_future} events with future timestamps",
                 }
             )
         return self
 
     def check_session_integrity(self) -> "DataQualityChecker":
         """Check that sessions have reasonable event counts."""
-        session_counts = self.df.groupby("session_id").size()
-        suspicious_sessions = session_counts[session_counts > 1000]
-        if len(suspicious_sessions) > 0:
+        session_counts = _value_counts(self.df["session_id"], dropna=True)
+        n_suspicious = int((session_counts > 1000).sum())
+        if n_suspicious > 0:
             self.issues.append(
                 {
                     "check": "session_integrity",
                     "severity": "medium",
-                    "count": len(suspicious_sessions),
-                    "message": f"Found {len(suspicious_sessions)} sessions with >1000 events",
+                    "count": n_suspicious,
+                    "message": f"Found {n_suspicious} sessions with >1000 events",
                 }
             )
         return self
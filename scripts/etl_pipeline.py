@@ -15,7 +15,11 @@ Usage:
 """
 
 import argparse
+import hashlib
+import json
 import logging
+import os
+import shutil
 import sys
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -23,9 +27,14 @@ from pathlib import Path
 from typing import Any
 
 import duckdb
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
-from data_validation import DataQualityChecker, validate_events
+from data_validation import DataQualityChecker, EventSchema, validate_events
 
 # Configure logging
 logging.basicConfig(
@@ -35,6 +44,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Event columns read by the session, daily and product aggregations
+AGGREGATION_COLUMNS = [
+    "event_id",
+    "user_id",
+    "session_id",
+    "timestamp",
+    "event_date",
+    "device",
+    "country",
+    "product_id",
+    "category",
+    "revenue",
+]
+
+# Small integer codes for the event types the aggregations count; the queries
+# compare these instead of the event_type strings
+EVENT_TYPE_CODES = {"page_view": 0, "product_view": 1, "add_to_cart": 2, "purchase": 3}
+
+# Fingerprint of the code that turns raw events into outputs (this module and
+# the validation it runs, including the utils it calls); editing any of them
+# invalidates every cached run
+SOURCE_HASH = hashlib.blake2b(
+    b"".join(
+        Path(__file__).with_name(name).read_bytes()
+        for name in ("etl_pipeline.py", "data_validation.py", "utils.py")
+    )
+).digest()
+
 
 @dataclass
 class PipelineConfig:
@@ -46,6 +83,8 @@ class PipelineConfig:
     min_validity_rate: float = 95.0
     enable_quality_checks: bool = True
     parallel_workers: int = 4
+    enable_cache: bool = True
+    max_cache_entries: int = 3
 
 
 @dataclass
@@ -83,6 +122,78 @@ class PipelineMetrics:
         }
 
 
+def _link_or_copy(source: Path, destination: Path) -> None:
+    """Hard-link a file into place, copying only where links are unsupported."""
+    destination.unlink(missing_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError:
+        # e.g. the cache and target are on different filesystems
+        shutil.copyfile(source, destination)
+
+
+class PipelineCache:
+    """
+    Content-addressed cache of pipeline outputs.
+
+    An entry is keyed on the source files (path, modification time and
+    size), the pipeline code and the options that affect the results, and
+    holds the output parquet files plus the run's metrics. Files are hard
+    links to the outputs where the filesystem allows, so caching a run does
+    not write or store a second copy of its tables. The least recently used
+    entries are evicted once there are more than ``max_entries``.
+    """
+
+    METRICS_FILE = "metrics.json"
+
+    def __init__(self, cache_dir: Path, max_entries: int = 3):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+
+    @staticmethod
+    def make_key(source_files: list[Path], options: dict[str, Any]) -> str:
+        """Compute the cache key of a run over the given source files."""
+        # Resolved, so a relative and an absolute path to a file share a key
+        stats = sorted(
+            (str(p.resolve()), p.stat().st_mtime_ns, p.stat().st_size) for p in source_files
+        )
+        fingerprint = repr((stats, sorted(options.items()))).encode()
+        return hashlib.blake2b(fingerprint + SOURCE_HASH, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Path | None:
+        """Get the directory of a complete cache entry, marking it as recently used."""
+        entry = self.cache_dir / key
+        if not (entry / self.METRICS_FILE).exists():
+            return None
+        os.utime(entry)
+        return entry
+
+    def put(self, key: str, output_files: list[Path], metrics: dict[str, Any]) -> None:
+        """Store a run's outputs and metrics, then evict the oldest entries."""
+        entry = self.cache_dir / key
+        staging = self.cache_dir / f".{key}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        for path in output_files:
+            _link_or_copy(path, staging / path.name)
+        # Written last: an entry without metrics is incomplete and never read
+        (staging / self.METRICS_FILE).write_text(json.dumps(metrics, default=str))
+        shutil.rmtree(entry, ignore_errors=True)
+        staging.rename(entry)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries beyond ``max_entries``."""
+        entries = sorted(
+            (p for p in self.cache_dir.iterdir() if p.is_dir() and not p.name.startswith(".")),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for entry in entries[self.max_entries :]:
+            logger.info(f"  Evicting cached run: {entry.name}")
+            shutil.rmtree(entry, ignore_errors=True)
+
+
 class ETLPipeline:
     """
     Main ETL pipeline class.
@@ -111,26 +222,35 @@ class ETLPipeline:
 
         logger.info("Database schema created successfully")
 
-    def _extract(self) -> pd.DataFrame:
-        """Extract raw event data from source files."""
-        logger.info(f"Extracting data from: {self.config.source_dir}")
-
-        # Find all parquet files
-        parquet_files = list(self.config.source_dir.glob("events_*.parquet"))
+    def _find_source_files(self) -> list[Path]:
+        """Find the raw event files to process."""
+        parquet_files = sorted(self.config.source_dir.glob("events_*.parquet"))
 
         if not parquet_files:
             raise FileNotFoundError(
                 f"No event files found in {self.config.source_dir}"
             )
 
-        # Load and concatenate all files
-        dfs = []
-        for file_path in sorted(parquet_files):
-            logger.info(f"  Loading: {file_path.name}")
-            df = pd.read_parquet(file_path)
-            dfs.append(df)
+        return parquet_files
+
+    def _extract(self, parquet_files: list[Path]) -> pd.DataFrame:
+        """Extract raw event data from source files."""
+        logger.info(f"Extracting data from: {self.config.source_dir}")
 
-        combined_df = pd.concat(dfs, ignore_index=True)
+        # Scan all files as one dataset, reading only the schema's columns with
+        # threaded decoding, and convert to pandas once instead of concatenating
+        # per-file frames. Up to `parallel_workers` files are read concurrently
+        for file_path in parquet_files:
+            logger.info(f"  Loading: {file_path.name}")
+        dataset = ds.dataset(parquet_files, format="parquet")
+        columns = [name for name in EventSchema.model_fields if name in dataset.schema.names]
+        table = dataset.to_table(
+            columns=columns,
+            use_threads=True,
+            fragment_readahead=max(1, self.config.parallel_workers),
+        )
+        combined_df = table.to_pandas(split_blocks=True, self_destruct=True)
+        del table
         self.metrics.records_extracted = len(combined_df)
 
         logger.info(f"Extracted {self.metrics.records_extracted:,} records")
@@ -144,18 +264,21 @@ class ETLPipeline:
         self.metrics.records_validated = result.valid_records
         self.metrics.validity_rate = result.validity_rate
 
-        # Check minimum validity threshold
-        if result.validity_rate < self.config.min_validity_rate:
+        self._check_validity_rate(result.validity_rate)
+        return valid_df
+
+    def _check_validity_rate(self, validity_rate: float) -> None:
+        """Fail the run if the validity rate is below the configured minimum."""
+        if validity_rate < self.config.min_validity_rate:
             error_msg = (
-                f"Validity rate {result.validity_rate:.1f}% is below "
+                f"Validity rate {validity_rate:.1f}% is below "
                 f"threshold {self.config.min_validity_rate:.1f}%"
             )
             logger.error(error_msg)
             self.metrics.errors.append(error_msg)
             raise ValueError(error_msg)
 
-        logger.info(f"Validation passed: {result.validity_rate:.1f}% valid")
-        return valid_df
+        logger.info(f"Validation passed: {validity_rate:.1f}% valid")
 
     def _run_quality_checks(self, df: pd.DataFrame) -> None:
         """Run data quality checks."""
@@ -191,82 +314,110 @@ class ETLPipeline:
 
         transformed = {}
 
-        # Ensure timestamp is datetime
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-
-        # 1. Fact events table (cleaned and enriched)
-        fct_events = df.copy()
-        fct_events["event_date"] = fct_events["timestamp"].dt.date
-        fct_events["event_hour"] = fct_events["timestamp"].dt.hour
-        fct_events["day_of_week"] = fct_events["timestamp"].dt.dayofweek
-        fct_events["is_weekend"] = fct_events["day_of_week"].isin([5, 6])
-        transformed["fct_events"] = fct_events
-
-        # 2. Session aggregations
-        fct_sessions = (
-            df.groupby(["session_id", "user_id"])
-            .agg(
-                session_start=("timestamp", "min"),
-                session_end=("timestamp", "max"),
-                event_count=("event_id", "count"),
-                page_views=("event_type", lambda x: (x == "page_view").sum()),
-                product_views=("event_type", lambda x: (x == "product_view").sum()),
-                add_to_carts=("event_type", lambda x: (x == "add_to_cart").sum()),
-                purchases=("event_type", lambda x: (x == "purchase").sum()),
-                total_revenue=("revenue", "sum"),
-                unique_products=("product_id", "nunique"),
-                countries=("country", "first"),
-                devices=("device", "first"),
-            )
-            .reset_index()
-        )
-        fct_sessions["session_duration_seconds"] = (
-            fct_sessions["session_end"] - fct_sessions["session_start"]
-        ).dt.total_seconds()
-        fct_sessions["is_converted"] = fct_sessions["purchases"] > 0
-        transformed["fct_sessions"] = fct_sessions
-
-        # 3. Daily metrics
-        df["event_date"] = df["timestamp"].dt.date
-        fct_daily = (
-            df.groupby("event_date")
-            .agg(
-                total_events=("event_id", "count"),
-                unique_users=("user_id", "nunique"),
-                unique_sessions=("session_id", "nunique"),
-                page_views=("event_type", lambda x: (x == "page_view").sum()),
-                product_views=("event_type", lambda x: (x == "product_view").sum()),
-                add_to_carts=("event_type", lambda x: (x == "add_to_cart").sum()),
-                purchases=("event_type", lambda x: (x == "purchase").sum()),
-                total_revenue=("revenue", "sum"),
-            )
-            .reset_index()
-        )
-        fct_daily["conversion_rate"] = fct_daily["purchases"] / fct_daily["unique_sessions"]
-        fct_daily["avg_revenue_per_user"] = fct_daily["total_revenue"] / fct_daily["unique_users"]
-        transformed["fct_daily_metrics"] = fct_daily
-
-        # 4. Product performance
-        product_events = df[df["product_id"].notna()].copy()
-        if len(product_events) > 0:
-            fct_products = (
-                product_events.groupby(["product_id", "category"])
-                .agg(
-                    view_count=("event_type", lambda x: (x == "product_view").sum()),
-                    cart_adds=("event_type", lambda x: (x == "add_to_cart").sum()),
-                    purchases=("event_type", lambda x: (x == "purchase").sum()),
-                    total_revenue=("revenue", "sum"),
-                    unique_viewers=("user_id", "nunique"),
-                )
-                .reset_index()
-            )
-            fct_products["cart_rate"] = (
-                fct_products["cart_adds"] / fct_products["view_count"].replace(0, 1)
-            )
-            fct_products["purchase_rate"] = (
-                fct_products["purchases"] / fct_products["view_count"].replace(0, 1)
-            )
-            transformed["fct_product_performance"] = fct_products
+        # Ensure timestamp is datetime; parquet sources usually already store it as
+        # such, and strings are parsed as ISO 8601 without per-row format inference
+        if not pd.api.types.is_datetime64_any_dtype(df["timestamp"]):
+            df["timestamp"] = pd.to_datetime(df["timestamp"], format="ISO8601", cache=True)
+
+        # 1. Fact events table (cleaned and enriched). The calendar columns are
+        # derived from the datetime64 values and added in place, so the event
+        # table is not copied and no Python date objects are created
+        timestamps = df["timestamp"]
+        if timestamps.dt.tz is not None:
+            # Calendar fields follow the local wall-clock time
+            timestamps = timestamps.dt.tz_localize(None)
+        ts = timestamps.to_numpy()
+        days = ts.astype("datetime64[D]")
+        # 1970-01-01 was a Thursday; Monday is 0
+        day_of_week = ((days.view(np.int64) + 3) % 7).astype(np.int32)
+        df["event_date"] = pd.arrays.ArrowExtensionArray(pa.array(days))
+        df["event_hour"] = ((ts - days) // np.timedelta64(1, "h")).astype(np.int32)
+        df["day_of_week"] = day_of_week
+        df["is_weekend"] = day_of_week >= 5
+        transformed["fct_events"] = df
+
+        # The aggregations run as SQL over the validated events. DuckDB gets them
+        # as an Arrow table (one contiguous buffer per column, converted once)
+        # rather than going through its pandas scanner on every query
+        events = pa.Table.from_pandas(df, columns=AGGREGATION_COLUMNS, preserve_index=False)
+        # Event types are counted on int8 codes (null for types not counted)
+        event_codes = pc.index_in(pa.array(df["event_type"]), pa.array(list(EVENT_TYPE_CODES)))
+        events = events.append_column("event_code", event_codes.cast(pa.int8()))
+        code = EVENT_TYPE_CODES
+        self.conn.register("events", events)
+        try:
+            # 2. Session aggregations
+            transformed["fct_sessions"] = self._query(f"""
+                SELECT
+                    session_id,
+                    user_id,
+                    MIN(timestamp) AS session_start,
+                    MAX(timestamp) AS session_end,
+                    COUNT(event_id) AS event_count,
+                    COUNT(*) FILTER (WHERE event_code = {code['page_view']}) AS page_views,
+                    COUNT(*) FILTER (WHERE event_code = {code['product_view']}) AS product_views,
+                    COUNT(*) FILTER (WHERE event_code = {code['add_to_cart']}) AS add_to_carts,
+                    COUNT(*) FILTER (WHERE event_code = {code['purchase']}) AS purchases,
+                    SUM(revenue) AS total_revenue,
+                    COUNT(DISTINCT product_id) AS unique_products,
+                    FIRST(country ORDER BY timestamp) FILTER (WHERE country IS NOT NULL)
+                        AS countries,
+                    FIRST(device ORDER BY timestamp) FILTER (WHERE device IS NOT NULL)
+                        AS devices,
+                    EXTRACT(EPOCH FROM MAX(timestamp) - MIN(timestamp))
+                        AS session_duration_seconds,
+                    purchases > 0 AS is_converted
+                FROM events
+                WHERE session_id IS NOT NULL AND user_id IS NOT NULL
+                GROUP BY session_id, user_id
+                ORDER BY session_id, user_id
+            """)
+
+            # 3. Daily metrics, grouped on the event_date already derived for
+            # fct_events rather than casting every timestamp again
+            transformed["fct_daily_metrics"] = self._query(f"""
+                SELECT
+                    event_date,
+                    COUNT(event_id) AS total_events,
+                    COUNT(DISTINCT user_id) AS unique_users,
+                    COUNT(DISTINCT session_id) AS unique_sessions,
+                    COUNT(*) FILTER (WHERE event_code = {code['page_view']}) AS page_views,
+                    COUNT(*) FILTER (WHERE event_code = {code['product_view']}) AS product_views,
+                    COUNT(*) FILTER (WHERE event_code = {code['add_to_cart']}) AS add_to_carts,
+                    COUNT(*) FILTER (WHERE event_code = {code['purchase']}) AS purchases,
+                    SUM(revenue) AS total_revenue,
+                    purchases / unique_sessions AS conversion_rate,
+                    total_revenue / unique_users AS avg_revenue_per_user
+                FROM events
+                WHERE event_date IS NOT NULL
+                GROUP BY event_date
+                ORDER BY event_date
+            """)
+            # .df() returns DATE columns as datetime64; keep event_date a date
+            daily = transformed["fct_daily_metrics"]
+            daily["event_date"] = daily["event_date"].astype(pd.ArrowDtype(pa.date32()))
+
+            # 4. Product performance
+            fct_products = self._query(f"""
+                SELECT
+                    product_id,
+                    category,
+                    COUNT(*) FILTER (WHERE event_code = {code['product_view']}) AS view_count,
+                    COUNT(*) FILTER (WHERE event_code = {code['add_to_cart']}) AS cart_adds,
+                    COUNT(*) FILTER (WHERE event_code = {code['purchase']}) AS purchases,
+                    SUM(revenue) AS total_revenue,
+                    COUNT(DISTINCT user_id) AS unique_viewers,
+                    cart_adds / IF(view_count = 0, 1, view_count) AS cart_rate,
+                    purchases / IF(view_count = 0, 1, view_count) AS purchase_rate
+                FROM events
+                WHERE product_id IS NOT NULL AND category IS NOT NULL
+                GROUP BY product_id, category
+                ORDER BY product_id, category
+            """)
+            if len(fct_products) > 0:
+                transformed["fct_product_performance"] = fct_products
+        finally:
+            self.conn.unregister("events")
 
         logger.info(f"Created {len(transformed)} transformed tables")
         for name, table in transformed.items():
@@ -274,6 +425,10 @@ class ETLPipeline:
 
         return transformed
 
+    def _query(self, sql: str) -> pd.DataFrame:
+        """Run a query on the pipeline database and return the result as a DataFrame."""
+        return self.conn.execute(sql).df()
+
     def _load(self, tables: dict[str, pd.DataFrame]) -> None:
         """Load transformed data to database and parquet files."""
         logger.info("Loading data...")
@@ -284,24 +439,71 @@ class ETLPipeline:
         total_loaded = 0
 
         for table_name, df in tables.items():
-            # Save to parquet
+            # Save to parquet (converted column by column on Arrow's thread pool,
+            # zstd-compressed with dictionary encoding for the repetitive strings)
             parquet_path = self.config.target_dir / f"{table_name}.parquet"
-            df.to_parquet(parquet_path, index=False)
+            # The previous output may be a hard link into the cache; writing a
+            # new file instead of truncating it leaves the cached copy intact
+            parquet_path.unlink(missing_ok=True)
+            pq.write_table(
+                pa.Table.from_pandas(df, preserve_index=False),
+                parquet_path,
+                compression="zstd",
+                compression_level=3,
+                use_dictionary=True,
+                write_statistics=True,
+            )
             logger.info(f"  Saved: {parquet_path}")
 
-            # Load to DuckDB
-            if self.conn is not None:
-                self.conn.execute(f"DROP TABLE IF EXISTS analytics.{table_name}")
-                self.conn.execute(
-                    f"CREATE TABLE analytics.{table_name} AS SELECT * FROM df"
-                )
-                logger.info(f"  Loaded to DuckDB: analytics.{table_name}")
+            # Load to DuckDB from the file just written, so the Arrow copy is
+            # released before DuckDB builds its table
+            self._load_parquet_to_db(table_name, parquet_path)
 
             total_loaded += len(df)
 
         self.metrics.records_loaded = total_loaded
         logger.info(f"Loaded {total_loaded:,} total records")
 
+    def _load_parquet_to_db(self, table_name: str, parquet_path: Path) -> None:
+        """(Re)create an analytics table from a parquet file, read by DuckDB directly."""
+        if self.conn is None:
+            return
+        self.conn.execute(f"DROP TABLE IF EXISTS analytics.{table_name}")
+        self.conn.execute(
+            f"CREATE TABLE analytics.{table_name} AS SELECT * FROM read_parquet(?)",
+            [str(parquet_path)],
+        )
+        logger.info(f"  Loaded to DuckDB: analytics.{table_name}")
+
+    def _cached_metrics(self) -> dict[str, Any]:
+        """Get the metrics of this run that are stored with its cached outputs."""
+        return {
+            "records_extracted": self.metrics.records_extracted,
+            "records_validated": self.metrics.records_validated,
+            "records_loaded": self.metrics.records_loaded,
+            "validity_rate": self.metrics.validity_rate,
+            "quality_issues": self.metrics.quality_issues,
+        }
+
+    def _restore(self, entry: Path) -> None:
+        """Restore a cached run's outputs into the target directory and database."""
+        logger.info(f"Source files unchanged, restoring outputs from cache: {entry}")
+
+        cached = json.loads((entry / PipelineCache.METRICS_FILE).read_text())
+        for name, value in cached.items():
+            setattr(self.metrics, name, value)
+        self._check_validity_rate(self.metrics.validity_rate)
+
+        self.config.target_dir.mkdir(parents=True, exist_ok=True)
+        for cached_path in sorted(entry.glob("*.parquet")):
+            parquet_path = self.config.target_dir / cached_path.name
+            _link_or_copy(cached_path, parquet_path)
+            logger.info(f"  Restored: {parquet_path}")
+
+            self._load_parquet_to_db(cached_path.stem, parquet_path)
+
+        logger.info(f"Restored {self.metrics.records_loaded:,} total records")
+
     def run(self) -> PipelineMetrics:
         """Execute the full ETL pipeline."""
         logger.info("=" * 60)
@@ -312,20 +514,42 @@ class ETLPipeline:
             # Setup
             self._setup_database()
 
-            # Extract
-            raw_df = self._extract()
+            source_files = self._find_source_files()
+
+            # Reuse the outputs of an earlier run over the same inputs
+            cache = cache_key = entry = None
+            if self.config.enable_cache:
+                cache = PipelineCache(
+                    self.config.target_dir / ".cache", self.config.max_cache_entries
+                )
+                cache_key = cache.make_key(
+                    source_files, {"quality_checks": self.config.enable_quality_checks}
+                )
+                entry = cache.get(cache_key)
 
-            # Validate
-            valid_df = self._validate(raw_df)
+            if entry is not None:
+                self._restore(entry)
+            else:
+                # Extract
+                raw_df = self._extract(source_files)
 
-            # Quality checks
-            self._run_quality_checks(valid_df)
+                # Validate
+                valid_df = self._validate(raw_df)
 
-            # Transform
-            transformed_tables = self._transform(valid_df)
+                # Quality checks
+                self._run_quality_checks(valid_df)
 
-            # Load
-            self._load(transformed_tables)
+                # Transform
+                transformed_tables = self._transform(valid_df)
+
+                # Load
+                self._load(transformed_tables)
+
+                if cache is not None:
+                    output_files = [
+                        self.config.target_dir / f"{name}.parquet" for name in transformed_tables
+                    ]
+                    cache.put(cache_key, output_files, self._cached_metrics())
 
             self.metrics.end_time = datetime.now()
 
@@ -375,11 +599,22 @@ def main():
         default=95.0,
         help="Minimum validity rate threshold",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of source files to read concurrently",
+    )
     parser.add_argument(
         "--skip-quality-checks",
         action="store_true",
         help="Skip data quality checks",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always reprocess the source files, ignoring cached outputs",
+    )
 
     args = parser.parse_args()
 
@@ -397,7 +632,9 @@ def main():
         target_dir=target_dir,
         database_path=database_path,
         min_validity_rate=args.min_validity,
+        parallel_workers=args.workers,
         enable_quality_checks=not args.skip_quality_checks,
+        enable_cache=not args.no_cache,
     )
 
     # Run pipeline
@@ -11,20 +11,64 @@ Usage:
 """
 
 import argparse
-import hashlib
-import json
 import random
-import uuid
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from itertools import repeat
 from pathlib import Path
 from typing import Any
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from faker import Faker
 
-# Initialize Faker with seed for reproducibility
-fake = Faker()
+try:
+    from scripts.utils import to_json
+except ImportError:  # run directly as a script from scripts/
+    from utils import to_json
+
+# Initialize Faker with seed for reproducibility. Values are picked uniformly
+# from its word lists; frequency-weighted picking is several times slower
+fake = Faker(use_weighting=False)
+
+# Free-text fields that are only decorative are drawn from a pool of this many
+# Faker values rather than generated per row
+FAKE_POOL_SIZE = 1000
+
+
+def fake_pool(make: Callable[[], Any], size: int = FAKE_POOL_SIZE) -> list[Any]:
+    """Call a Faker provider `size` times, to sample values from with random.choice."""
+    return [make() for _ in range(size)]
+
+
+def write_parquet(df: pd.DataFrame, path: Path) -> None:
+    """Write a frame to parquet through pyarrow, zstd-compressed.
+
+    Categorical columns are written as dictionary-encoded columns.
+    """
+    pq.write_table(
+        pa.Table.from_pandas(df, preserve_index=False),
+        path,
+        compression="zstd",
+        compression_level=3,
+        use_dictionary=True,
+        write_statistics=True,
+        row_group_size=1_000_000,
+    )
+
+
+def random_hex_ids(prefix: str, num_bytes: int, n: int) -> list[str]:
+    """Generate `n` IDs of `num_bytes` random bytes as upper-case hex after `prefix`.
+
+    All bytes are drawn in a single call from NumPy's (seeded) generator, which is
+    much cheaper than a uuid4() per ID; these are synthetic, not secret, IDs.
+    """
+    digits = np.random.bytes(num_bytes * n).hex().upper()
+    width = 2 * num_bytes
+    return [f"{prefix}{digits[i : i + width]}" for i in range(0, len(digits), width)]
 
 
 class EventType:
@@ -71,20 +115,29 @@ class ProductCatalog:
     PRODUCTS_PER_CATEGORY = 50
 
     def __init__(self, seed: int | None = None):
-        if seed:
+        if seed is not None:
             random.seed(seed)
             np.random.seed(seed)
             Faker.seed(seed)
 
         self.products = self._generate_catalog()
+        # Prices by product index, so multi-item carts and orders are priced
+        # with one array lookup
+        self.prices = np.array([p["price"] for p in self.products])
+
+        # Products grouped by category, built once for lookups
+        self._by_category: dict[str, list[dict[str, Any]]] = {}
+        for product in self.products:
+            self._by_category.setdefault(product["category"], []).append(product)
 
     def _generate_catalog(self) -> list[dict[str, Any]]:
         """Generate a product catalog with realistic attributes."""
         products = []
 
-        for category in self.CATEGORIES:
+        for category_index, category in enumerate(self.CATEGORIES):
             for i in range(self.PRODUCTS_PER_CATEGORY):
-                product_id = f"PROD_{hashlib.md5(f'{category}_{i}'.encode()).hexdigest()[:8].upper()}"
+                # Deterministic 8-hex-digit ID: 3 digits of category, 5 of item
+                product_id = f"PROD_{category_index:03X}{i:05X}"
 
                 # Price varies by category
                 base_price = {
@@ -120,9 +173,13 @@ class ProductCatalog:
         """Get a random product from the catalog."""
         return random.choice(self.products)
 
+    def sample_indices(self, n: int) -> np.ndarray:
+        """Draw `n` random product indices at once."""
+        return np.random.randint(0, len(self.products), size=n)
+
     def get_products_by_category(self, category: str) -> list[dict[str, Any]]:
         """Get all products in a category."""
-        return [p for p in self.products if p["category"] == category]
+        return list(self._by_category.get(category, []))
 
     def to_dataframe(self) -> pd.DataFrame:
         """Export catalog as DataFrame."""
@@ -132,14 +189,49 @@ class ProductCatalog:
 class UserPool:
     """Simulated user pool with behavioral patterns."""
 
+    DEVICES = ["mobile", "desktop", "tablet"]
+
+    TRAFFIC_SOURCES = ["organic", "paid_search", "social", "email", "direct", "referral"]
+
+    COUNTRIES = ["US", "UK", "DE", "FR", "CA", "AU", "NL", "ES", "IT", "BR"]
+
     def __init__(self, num_users: int = 10000, seed: int | None = None):
-        if seed:
+        if seed is not None:
             random.seed(seed)
             np.random.seed(seed)
             Faker.seed(seed)
 
         self.users = self._generate_users(num_users)
 
+        self.segments = np.array([u["segment"] for u in self.users])
+
+        # Activity weights, normalized once: power buyers are more likely to
+        # appear in events
+        weights = np.where(
+            self.segments == "power_buyer", 3.0, np.where(self.segments == "browser", 1.5, 1.0)
+        )
+        self._weights = weights / weights.sum()
+        # Cumulative weights for inverse-CDF draws; pin the end to 1.0 so
+        # rounding can never push a draw past the last user
+        self._cdf = np.cumsum(self._weights)
+        self._cdf[-1] = 1.0
+
+        # The user columns every event carries, looked up for all events at once
+        self.event_columns = pd.DataFrame(
+            {
+                "user_id": [u["user_id"] for u in self.users],
+                "device": pd.Categorical(
+                    [u["primary_device"] for u in self.users], categories=self.DEVICES
+                ),
+                "country": pd.Categorical(
+                    [u["country"] for u in self.users], categories=self.COUNTRIES
+                ),
+                "traffic_source": pd.Categorical(
+                    [u["traffic_source"] for u in self.users], categories=self.TRAFFIC_SOURCES
+                ),
+            }
+        )
+
     def _generate_users(self, num_users: int) -> list[dict[str, Any]]:
         """Generate user profiles with behavioral attributes."""
         users = []
@@ -152,16 +244,20 @@ class UserPool:
             ("new_user", 0.20),  # 20% - recently joined
         ]
 
-        for i in range(num_users):
-            user_id = f"USER_{uuid.uuid4().hex[:12].upper()}"
+        user_ids = random_hex_ids("USER_", 6, num_users)
+        cities = fake_pool(fake.city, min(num_users, FAKE_POOL_SIZE))
+
+        # Sign-up times within the last two years, to the second
+        now = np.datetime64(datetime.now(), "s")
+        two_years = 2 * 365 * 24 * 60 * 60
+        created_at = (now - np.random.randint(0, two_years + 1, size=num_users)).tolist()
+
+        for user_id, user_created_at in zip(user_ids, created_at, strict=True):
 
             # Assign segment based on probabilities
-            segment = np.random.choice(
-                [s[0] for s in segments], p=[s[1] for s in segments]
-            )
+            segment = np.random.choice([s[0] for s in segments], p=[s[1] for s in segments])
 
             # Device preferences
-            devices = ["mobile", "desktop", "tablet"]
             device_probs = {
                 "power_buyer": [0.3, 0.6, 0.1],
                 "browser": [0.6, 0.3, 0.1],
@@ -169,10 +265,9 @@ class UserPool:
                 "new_user": [0.7, 0.2, 0.1],
             }
 
-            primary_device = np.random.choice(devices, p=device_probs[segment])
+            primary_device = np.random.choice(self.DEVICES, p=device_probs[segment])
 
             # Traffic source
-            sources = ["organic", "paid_search", "social", "email", "direct", "referral"]
             source_probs = {
                 "power_buyer": [0.3, 0.2, 0.1, 0.15, 0.2, 0.05],
                 "browser": [0.2, 0.3, 0.25, 0.1, 0.1, 0.05],
@@ -180,24 +275,21 @@ class UserPool:
                 "new_user": [0.15, 0.35, 0.3, 0.05, 0.1, 0.05],
             }
 
-            traffic_source = np.random.choice(sources, p=source_probs[segment])
+            traffic_source = np.random.choice(self.TRAFFIC_SOURCES, p=source_probs[segment])
 
             # Geographic distribution
-            countries = ["US", "UK", "DE", "FR", "CA", "AU", "NL", "ES", "IT", "BR"]
             country_probs = [0.40, 0.15, 0.10, 0.08, 0.07, 0.05, 0.05, 0.04, 0.03, 0.03]
 
             users.append(
                 {
                     "user_id": user_id,
-                    "email": fake.email(),
+                    "email": f"{user_id.lower()}@example.com",
                     "segment": segment,
                     "primary_device": primary_device,
                     "traffic_source": traffic_source,
-                    "country": np.random.choice(countries, p=country_probs),
-                    "city": fake.city(),
-                    "created_at": fake.date_time_between(
-                        start_date="-2y", end_date="now"
-                    ),
+                    "country": np.random.choice(self.COUNTRIES, p=country_probs),
+                    "city": random.choice(cities),
+                    "created_at": user_created_at,
                     "is_subscribed": random.random() > 0.6,
                     "lifetime_value": 0.0,  # Will be calculated from events
                 }
@@ -207,17 +299,11 @@ class UserPool:
 
     def get_random_user(self) -> dict[str, Any]:
         """Get a random user, weighted by activity level."""
-        # Power buyers are more likely to appear in events
-        weights = [
-            (
-                3.0
-                if u["segment"] == "power_buyer"
-                else 1.5 if u["segment"] == "browser" else 1.0
-            )
-            for u in self.users
-        ]
-        weights = np.array(weights) / sum(weights)
-        return np.random.choice(self.users, p=weights)
+        return self.users[self.sample_indices(1)[0]]
+
+    def sample_indices(self, n: int) -> np.ndarray:
+        """Draw `n` user indices at once, weighted by activity level."""
+        return np.searchsorted(self._cdf, np.random.random(n), side="right")
 
     def to_dataframe(self) -> pd.DataFrame:
         """Export users as DataFrame."""
@@ -234,36 +320,10 @@ class EventGenerator:
     - Time distribution follows hourly/daily patterns
     """
 
-    def __init__(
-        self,
-        num_events: int,
-        num_days: int,
-        num_users: int = 10000,
-        seed: int | None = None,
-    ):
-        self.num_events = num_events
-        self.num_days = num_days
-        self.seed = seed
-
-        if seed:
-            random.seed(seed)
-            np.random.seed(seed)
-
-        self.catalog = ProductCatalog(seed=seed)
-        self.user_pool = UserPool(num_users=num_users, seed=seed)
-
-        # Track user sessions
-        self.active_sessions: dict[str, dict] = {}
-        self.session_timeout_minutes = 30
-
-    def _generate_timestamp(self, start_date: datetime, end_date: datetime) -> datetime:
-        """Generate timestamp with realistic hourly/daily patterns."""
-        # Random date within range
-        days_range = (end_date - start_date).days
-        random_day = start_date + timedelta(days=random.randint(0, days_range))
-
-        # Hour distribution (more activity during business hours and evening)
-        hour_weights = [
+    # Hour distribution (more activity during business hours and evening),
+    # normalized to probabilities once
+    HOUR_WEIGHTS = np.array(
+        [
             0.01,
             0.005,
             0.005,
@@ -289,51 +349,106 @@ class EventGenerator:
             0.04,
             0.02,  # 6-11 PM
         ]
+    )
+    HOUR_WEIGHTS /= HOUR_WEIGHTS.sum()
 
-        # Weekend has different pattern (more midday activity)
-        if random_day.weekday() >= 5:
-            hour_weights = [
-                0.01,
-                0.01,
-                0.01,
-                0.01,
-                0.01,
-                0.02,  # 0-5 AM
-                0.02,
-                0.04,
-                0.06,
-                0.08,
-                0.09,
-                0.10,  # 6-11 AM
-                0.10,
-                0.09,
-                0.08,
-                0.07,
-                0.06,
-                0.06,  # 12-5 PM
-                0.05,
-                0.05,
-                0.04,
-                0.03,
-                0.02,
-                0.01,  # 6-11 PM
-            ]
+    # Weekend has different pattern (more midday activity)
+    WEEKEND_HOUR_WEIGHTS = np.array(
+        [
+            0.01,
+            0.01,
+            0.01,
+            0.01,
+            0.01,
+            0.02,  # 0-5 AM
+            0.02,
+            0.04,
+            0.06,
+            0.08,
+            0.09,
+            0.10,  # 6-11 AM
+            0.10,
+            0.09,
+            0.08,
+            0.07,
+            0.06,
+            0.06,  # 12-5 PM
+            0.05,
+            0.05,
+            0.04,
+            0.03,
+            0.02,
+            0.01,  # 6-11 PM
+        ]
+    )
+    WEEKEND_HOUR_WEIGHTS /= WEEKEND_HOUR_WEIGHTS.sum()
+
+    # Number of session IDs generated at a time
+    SESSION_ID_BATCH = 4096
+
+    def __init__(
+        self,
+        num_events: int,
+        num_days: int,
+        num_users: int = 10000,
+        seed: int | None = None,
+    ):
+        self.num_events = num_events
+        self.num_days = num_days
+        self.seed = seed
+
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed)
+
+        self.catalog = ProductCatalog(seed=seed)
+        self.user_pool = UserPool(num_users=num_users, seed=seed)
 
-        hour_weights = np.array(hour_weights) / sum(hour_weights)
-        hour = np.random.choice(range(24), p=hour_weights)
+        # Track user sessions
+        self.active_sessions: dict[str, dict] = {}
+        self.session_timeout_minutes = 30
+        # New session IDs are drawn in batches and handed out on demand
+        self._session_id_pool: list[str] = []
 
-        minute = random.randint(0, 59)
-        second = random.randint(0, 59)
-        microsecond = random.randint(0, 999999)
+        # Page view titles and referrers
+        pool_size = min(num_events, FAKE_POOL_SIZE)
+        self._page_titles = fake_pool(lambda: fake.sentence(nb_words=4), pool_size)
+        self._referrers = fake_pool(fake.url, pool_size)
 
-        return random_day.replace(
-            hour=hour, minute=minute, second=second, microsecond=microsecond
+    def _generate_timestamps(self, start_date: datetime, end_date: datetime, n: int) -> np.ndarray:
+        """Generate `n` datetime64[us] timestamps with realistic hourly/daily patterns."""
+        # Random dates within range
+        days_range = (end_date - start_date).days
+        day_offsets = np.random.randint(0, days_range + 1, size=n)
+
+        # Weekday and weekend hours are each drawn in one batch
+        is_weekend = (start_date.weekday() + day_offsets) % 7 >= 5
+        hours = np.empty(n, dtype=np.int64)
+        for mask, weights in (
+            (~is_weekend, self.HOUR_WEIGHTS),
+            (is_weekend, self.WEEKEND_HOUR_WEIGHTS),
+        ):
+            hours[mask] = np.random.choice(24, size=mask.sum(), p=weights)
+
+        minutes = np.random.randint(0, 60, size=n)
+        seconds = np.random.randint(0, 60, size=n)
+        microseconds = np.random.randint(0, 1_000_000, size=n)
+
+        midnight = np.datetime64(start_date.date(), "us")
+        return (
+            midnight
+            + day_offsets * np.timedelta64(1, "D")
+            + hours * np.timedelta64(1, "h")
+            + minutes * np.timedelta64(1, "m")
+            + seconds * np.timedelta64(1, "s")
+            + microseconds * np.timedelta64(1, "us")
         )
 
-    def _get_or_create_session(
-        self, user: dict[str, Any], timestamp: datetime
-    ) -> str:
-        """Get existing session or create new one."""
+    def _get_or_create_session(self, user: dict[str, Any], timestamp: int) -> str:
+        """Get existing session or create new one.
+
+        `timestamp` is the event time as integer microseconds since the epoch.
+        """
         user_id = user["user_id"]
 
         if user_id in self.active_sessions:
@@ -341,19 +456,20 @@ class EventGenerator:
             last_activity = session["last_activity"]
 
             # Check if session is still active
-            if (timestamp - last_activity).total_seconds() < self.session_timeout_minutes * 60:
+            if timestamp - last_activity < self.session_timeout_minutes * 60_000_000:
                 session["last_activity"] = timestamp
                 session["event_count"] += 1
                 return session["session_id"]
 
         # Create new session
-        session_id = f"SES_{uuid.uuid4().hex[:16].upper()}"
+        if not self._session_id_pool:
+            self._session_id_pool = random_hex_ids("SES_", 8, self.SESSION_ID_BATCH)
+        session_id = self._session_id_pool.pop()
         self.active_sessions[user_id] = {
             "session_id": session_id,
             "start_time": timestamp,
             "last_activity": timestamp,
             "event_count": 1,
-            "cart": [],
         }
 
         return session_id
@@ -381,9 +497,9 @@ class EventGenerator:
                 "/blog",
             ]
             properties["page_path"] = random.choice(pages)
-            properties["page_title"] = fake.sentence(nb_words=4)
+            properties["page_title"] = random.choice(self._page_titles)
             properties["referrer"] = (
-                fake.url() if random.random() > 0.3 else None
+                random.choice(self._referrers) if random.random() > 0.3 else None
             )
 
         elif event_type == EventType.PRODUCT_VIEW:
@@ -396,7 +512,7 @@ class EventGenerator:
 
         elif event_type == EventType.ADD_TO_CART:
             product = self.catalog.get_random_product()
-            quantity = np.random.choice([1, 2, 3, 4, 5], p=[0.6, 0.25, 0.1, 0.03, 0.02])
+            quantity = int(np.random.choice([1, 2, 3, 4, 5], p=[0.6, 0.25, 0.1, 0.03, 0.02]))
             properties["product_id"] = product["product_id"]
             properties["product_name"] = product["product_name"]
             properties["category"] = product["category"]
@@ -404,12 +520,6 @@ class EventGenerator:
             properties["quantity"] = quantity
             properties["cart_value"] = round(product["price"] * quantity, 2)
 
-            # Track in session cart
-            if user["user_id"] in self.active_sessions:
-                self.active_sessions[user["user_id"]]["cart"].append(
-                    {"product": product, "quantity": quantity}
-                )
-
         elif event_type == EventType.REMOVE_FROM_CART:
             product = self.catalog.get_random_product()
             properties["product_id"] = product["product_id"]
@@ -417,11 +527,9 @@ class EventGenerator:
             properties["price"] = product["price"]
 
         elif event_type == EventType.BEGIN_CHECKOUT:
-            # Use session cart if available
+            # Cart contents are drawn at random, independent of earlier events
             cart_items = random.randint(1, 5)
-            cart_value = sum(
-                self.catalog.get_random_product()["price"] for _ in range(cart_items)
-            )
+            cart_value = float(self.catalog.prices[self.catalog.sample_indices(cart_items)].sum())
             properties["cart_items"] = cart_items
             properties["cart_value"] = round(cart_value, 2)
             properties["checkout_step"] = "shipping"
@@ -429,13 +537,14 @@ class EventGenerator:
         elif event_type == EventType.PURCHASE:
             # Purchase event with order details
             order_items = random.randint(1, 5)
-            products = [self.catalog.get_random_product() for _ in range(order_items)]
-            subtotal = sum(p["price"] for p in products)
+            indices = self.catalog.sample_indices(order_items)
+            products = [self.catalog.products[i] for i in indices.tolist()]
+            subtotal = float(self.catalog.prices[indices].sum())
             tax = round(subtotal * 0.08, 2)  # 8% tax
             shipping = round(random.uniform(0, 15), 2)
             total = round(subtotal + tax + shipping, 2)
 
-            properties["order_id"] = f"ORD_{uuid.uuid4().hex[:12].upper()}"
+            properties["order_id"] = random_hex_ids("ORD_", 6, 1)[0]
             properties["items"] = [
                 {
                     "product_id": p["product_id"],
@@ -474,104 +583,176 @@ class EventGenerator:
             properties["search_type"] = random.choice(["text", "voice", "image"])
 
         elif event_type == EventType.SIGNUP:
-            properties["signup_source"] = random.choice(
-                ["organic", "paid", "referral", "social"]
-            )
+            properties["signup_source"] = random.choice(["organic", "paid", "referral", "social"])
             properties["has_subscribed"] = random.random() > 0.4
 
         elif event_type == EventType.LOGIN:
-            properties["login_method"] = random.choice(
-                ["email", "google", "facebook", "apple"]
-            )
+            properties["login_method"] = random.choice(["email", "google", "facebook", "apple"])
             properties["is_returning"] = random.random() > 0.3
 
         return properties
 
-    def generate(self) -> pd.DataFrame:
-        """Generate all events and return as DataFrame."""
+    def generate(self, workers: int = 1) -> pd.DataFrame:
+        """Generate all events and return as DataFrame.
+
+        With `workers` > 1, events are generated in that many processes, each
+        owning the events of a disjoint set of users so sessions stay intact.
+        """
         print(f"Generating {self.num_events:,} events over {self.num_days} days...")
 
         end_date = datetime.now()
         start_date = end_date - timedelta(days=self.num_days)
 
-        events = []
+        user_indices = self.user_pool.sample_indices(self.num_events)
+
+        if workers > 1:
+            shards = [user_indices[user_indices % workers == shard] for shard in range(workers)]
+            # Independent child streams of the run's seed (or of fresh entropy
+            # when unseeded); unlike seed + shard, they never coincide with the
+            # streams of a run seeded with a nearby value
+            shard_seeds = np.random.SeedSequence(self.seed).spawn(workers)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                frames = list(
+                    executor.map(
+                        self._generate_shard,
+                        shards,
+                        shard_seeds,
+                        repeat(start_date),
+                        repeat(end_date),
+                    )
+                )
+            df = pd.concat(frames, ignore_index=True)
+        else:
+            df = self._generate_events(user_indices, start_date, end_date)
+
+        # Sort by timestamp, applying a single argsort permutation to the rows
+        order = np.argsort(df["timestamp"].to_numpy(), kind="stable")
+        df = df.take(order).reset_index(drop=True)
+
+        print(f"Generated {len(df):,} events successfully!")
+
+        return df
+
+    def _generate_shard(
+        self,
+        user_indices: np.ndarray,
+        seed_sequence: np.random.SeedSequence,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> pd.DataFrame:
+        """Generate one worker's events, with its own random state."""
+        # Worker processes may start with a copy of the parent's random state,
+        # so every shard reseeds from its own stream
+        state = seed_sequence.generate_state(4)
+        random.seed(int.from_bytes(state.tobytes(), "little"))
+        np.random.seed(state)
+        return self._generate_events(user_indices, start_date, end_date)
+
+    def _generate_events(
+        self, user_indices: np.ndarray, start_date: datetime, end_date: datetime
+    ) -> pd.DataFrame:
+        """Generate one event per sampled user index, in generation order."""
+        num_events = len(user_indices)
         event_types = list(EventType.PROBABILITIES.keys())
         event_probs = list(EventType.PROBABILITIES.values())
 
-        for i in range(self.num_events):
+        # Event types, timestamps and IDs are drawn for all events up front;
+        # the loop only applies the per-event logic and assembles the rows
+        users = self.user_pool.users
+        type_codes = np.random.choice(len(event_types), size=num_events, p=event_probs)
+
+        # Power buyers are more likely to convert: 40% of their page and
+        # product views become an add-to-cart or a purchase instead
+        code = {event_type: i for i, event_type in enumerate(event_types)}
+        boost = (
+            (self.user_pool.segments[user_indices] == "power_buyer")
+            & np.isin(type_codes, [code[EventType.PAGE_VIEW], code[EventType.PRODUCT_VIEW]])
+            & (np.random.random(num_events) > 0.6)
+        )
+        type_codes[boost] = np.random.choice(
+            [code[EventType.ADD_TO_CART], code[EventType.PURCHASE]], size=int(boost.sum())
+        )
+
+        timestamps = self._generate_timestamps(start_date, end_date, num_events)
+        event_ids = random_hex_ids("EVT_", 8, num_events)
+
+        # Each output column is filled in place by event index, so the frame is
+        # built from whole columns instead of transposing per-event dicts
+        session_id_col: list[str | None] = [None] * num_events
+        properties_col: list[str | None] = [None] * num_events
+        product_id_col: list[str | None] = [None] * num_events
+        category_col: list[str | None] = [None] * num_events
+        revenue_col = np.zeros(num_events, dtype=np.float64)
+
+        for i, (user_index, type_code, timestamp) in enumerate(
+            zip(
+                user_indices.tolist(),
+                type_codes.tolist(),
+                # Plain integer microseconds; no datetime object per event
+                timestamps.view(np.int64).tolist(),
+                strict=True,
+            )
+        ):
             if (i + 1) % 10000 == 0:
                 print(f"  Generated {i + 1:,} events...")
 
-            # Select user and event type
-            user = self.user_pool.get_random_user()
-            event_type = np.random.choice(event_types, p=event_probs)
-
-            # Adjust probabilities based on user segment
-            if user["segment"] == "power_buyer" and event_type in [
-                EventType.PAGE_VIEW,
-                EventType.PRODUCT_VIEW,
-            ]:
-                # Power buyers are more likely to convert
-                if random.random() > 0.6:
-                    event_type = random.choice(
-                        [EventType.ADD_TO_CART, EventType.PURCHASE]
-                    )
+            user = users[user_index]
+            event_type = event_types[type_code]
 
-            # Generate timestamp and session
-            timestamp = self._generate_timestamp(start_date, end_date)
+            # Get or create the session
             session_id = self._get_or_create_session(user, timestamp)
 
             # Generate event properties
             properties = self._generate_event_properties(event_type, user, session_id)
 
-            event = {
-                "event_id": f"EVT_{uuid.uuid4().hex[:16].upper()}",
-                "event_type": event_type,
-                "user_id": user["user_id"],
-                "session_id": session_id,
-                "timestamp": timestamp.isoformat(),
-                "properties": json.dumps(properties),
-                # Flattened common properties for easier querying
-                "device": properties.get("device"),
-                "country": properties.get("country"),
-                "traffic_source": properties.get("traffic_source"),
-                # Event-specific flattened fields
-                "product_id": properties.get("product_id"),
-                "category": properties.get("category"),
-                "revenue": properties.get("total", 0.0),
+            session_id_col[i] = session_id
+            properties_col[i] = to_json(properties)
+            # Event-specific flattened fields
+            product_id_col[i] = properties.get("product_id")
+            category_col[i] = properties.get("category")
+            revenue_col[i] = properties.get("total", 0.0)
+
+        # Flattened common properties for easier querying; they come from the
+        # user, so they are gathered for all events with one take
+        user_columns = self.user_pool.event_columns.take(user_indices)
+
+        # Low-cardinality columns are categoricals over their fixed value sets,
+        # stored as small integer codes (and dictionary-encoded in parquet)
+        return pd.DataFrame(
+            {
+                "event_id": event_ids,
+                "event_type": pd.Categorical.from_codes(type_codes, categories=event_types),
+                "user_id": user_columns["user_id"].array,
+                "session_id": session_id_col,
+                "timestamp": timestamps,
+                "properties": properties_col,
+                "device": user_columns["device"].array,
+                "country": user_columns["country"].array,
+                "traffic_source": user_columns["traffic_source"].array,
+                "product_id": product_id_col,
+                "category": pd.Categorical(category_col, categories=ProductCatalog.CATEGORIES),
+                "revenue": revenue_col,
             }
-
-            events.append(event)
-
-        # Sort by timestamp
-        df = pd.DataFrame(events)
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df = df.sort_values("timestamp").reset_index(drop=True)
-
-        print(f"Generated {len(df):,} events successfully!")
-
-        return df
+        )
 
     def save_reference_data(self, output_dir: Path) -> None:
         """Save product catalog and user data as reference files."""
         # Save product catalog
         products_df = self.catalog.to_dataframe()
         products_path = output_dir / "products.parquet"
-        products_df.to_parquet(products_path, index=False)
+        write_parquet(products_df, products_path)
         print(f"Saved product catalog: {products_path}")
 
         # Save user profiles (without PII for privacy)
         users_df = self.user_pool.to_dataframe()
         users_df = users_df.drop(columns=["email"])  # Remove PII
         users_path = output_dir / "users.parquet"
-        users_df.to_parquet(users_path, index=False)
+        write_parquet(users_df, users_path)
         print(f"Saved user profiles: {users_path}")
 
 
 def main():
-    parser = argparse.ArgumentParser(
-        description="Generate synthetic e-commerce event data"
-    )
+    parser = argparse.ArgumentParser(description="Generate synthetic e-commerce event data")
     parser.add_argument(
         "--events",
         type=int,
@@ -590,6 +771,12 @@ def main():
         default=10000,
         help="Number of users in the pool (default: 10000)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes to generate events in (default: 1)",
+    )
     parser.add_argument(
         "--seed",
         type=int,
@@ -618,12 +805,12 @@ def main():
         seed=args.seed,
     )
 
-    events_df = generator.generate()
+    events_df = generator.generate(workers=args.workers)
 
     # Save events
     date_str = datetime.now().strftime("%Y%m%d")
     events_path = output_dir / f"events_{date_str}.parquet"
-    events_df.to_parquet(events_path, index=False)
+    write_parquet(events_df, events_path)
     print(f"\nSaved events: {events_path}")
 
     # Save reference data
@@ -7,19 +7,68 @@ Common helper functions used across the pipeline.
 
 import hashlib
 import json
+import logging
 import os
+import re
+import time
+from collections.abc import Mapping
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:  # optional (the "fast" extra); the standard library is used instead
+    orjson = None  # type: ignore[assignment]
+
+# Digit runs long enough to hold an integer outside the 64-bit range
+_LONG_DIGIT_RUN = re.compile(r"\d{19}")
+
+# Display symbols for format_currency; other codes are printed as a prefix
+_CCY_SYMBOLS: dict[str, str] = {"USD": "$", "EUR": "€", "GBP": "£"}
+
+# Calendar names for the date dimension, indexed by day_of_week (Monday = 0)
+# and by month number (slot 0 unused). An Index takes pandas' default string
+# dtype, matching what the .dt name accessors return.
+_DAY_NAMES = pd.Index(
+    ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+)
+_MONTH_NAMES = pd.Index(
+    [
+        "",
+        "January",
+        "February",
+        "March",
+        "April",
+        "May",
+        "June",
+        "July",
+        "August",
+        "September",
+        "October",
+        "November",
+        "December",
+    ]
+)
+
+
+@lru_cache(maxsize=256)
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO date string, memoized for repeated range bounds."""
+    return datetime.fromisoformat(value)
+
 
 def generate_date_range(
     start_date: str | datetime,
     end_date: str | datetime | None = None,
     days: int | None = None,
-) -> list[datetime]:
+    as_index: bool = False,
+) -> list[datetime] | pd.DatetimeIndex:
     """
     Generate a list of dates in a range.
 
@@ -27,33 +76,56 @@ def generate_date_range(
         start_date: Start date (string or datetime)
         end_date: End date (optional)
         days: Number of days from start (optional)
+        as_index: Return a DatetimeIndex instead of boxing each date
 
     Returns:
-        List of datetime objects
+        List of datetime objects, or a DatetimeIndex if as_index is set
     """
     if isinstance(start_date, str):
-        start_date = datetime.fromisoformat(start_date)
+        start_date = _parse_iso(start_date)
 
     if end_date is not None:
         if isinstance(end_date, str):
-            end_date = datetime.fromisoformat(end_date)
+            end_date = _parse_iso(end_date)
     elif days is not None:
         end_date = start_date + timedelta(days=days)
     else:
         end_date = datetime.now()
 
-    dates = []
-    current = start_date
-    while current <= end_date:
-        dates.append(current)
-        current += timedelta(days=1)
-
-    return dates
+    dates = pd.date_range(start=start_date, end=end_date, freq="D")
+    return dates if as_index else dates.to_pydatetime().tolist()
 
 
 def hash_string(value: str, length: int = 8) -> str:
     """Generate a deterministic hash of a string."""
-    return hashlib.md5(value.encode()).hexdigest()[:length].upper()
+    # BLAKE2b sizes its digest to the hex length wanted (at most 64 bytes)
+    digest_size = min(max(1, (length + 1) // 2), 64)
+    return hashlib.blake2b(value.encode(), digest_size=digest_size).hexdigest()[:length].upper()
+
+
+def to_json(obj: Any) -> str:
+    """Serialize to compact JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def json_loads(text: str) -> Any:
+    """
+    Decode JSON, using orjson when it is installed.
+
+    Results match json.loads, and invalid text raises json.JSONDecodeError.
+    """
+    # orjson parses integers wider than 64 bits as lossy floats (or rejects
+    # them, depending on version), so text with long digit runs skips it
+    if orjson is not None and _LONG_DIGIT_RUN.search(text) is None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # orjson is stricter (e.g. NaN literals), so let json.loads
+            # have the final say
+            pass
+    return json.loads(text)
 
 
 def safe_json_loads(value: str | dict) -> dict[str, Any]:
@@ -62,7 +134,7 @@ def safe_json_loads(value: str | dict) -> dict[str, Any]:
         return value
     if isinstance(value, str):
         try:
-            return json.loads(value)
+            return json_loads(value)
         except json.JSONDecodeError:
             return {}
     return {}
@@ -88,28 +160,38 @@ def flatten_dict(
         >>> flatten_dict({"a": {"b": 1, "c": 2}})
         {"a_b": 1, "a_c": 2}
     """
-    items: list[tuple[str, Any]] = []
-    for k, v in d.items():
-        new_key = f"{parent_key}{sep}{k}" if parent_key else k
-        if isinstance(v, dict):
-            items.extend(flatten_dict(v, new_key, sep).items())
+    flat: dict[str, Any] = {}
+    # Walk depth-first with an explicit stack of item iterators so keys come
+    # out in the same order as a recursive walk
+    stack = [(parent_key, iter(d.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for k, v in items:
+            new_key = f"{prefix}{sep}{k}" if prefix else k
+            if isinstance(v, dict):
+                stack.append((new_key, iter(v.items())))
+                break
+            flat[new_key] = v
         else:
-            items.append((new_key, v))
-    return dict(items)
+            stack.pop()
+    return flat
 
 
 def get_file_info(file_path: Path | str) -> dict[str, Any]:
     """Get metadata about a file."""
-    path = Path(file_path)
+    path = os.fspath(file_path)
 
-    if not path.exists():
+    # A single stat call doubles as the existence check
+    try:
+        stat = os.stat(path)
+    except OSError:
         return {"exists": False}
 
-    stat = path.stat()
+    abs_path = os.path.abspath(path)
     return {
         "exists": True,
-        "name": path.name,
-        "path": str(path.absolute()),
+        "name": os.path.basename(abs_path),
+        "path": abs_path,
         "size_bytes": stat.st_size,
         "size_mb": round(stat.st_size / (1024 * 1024), 2),
         "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
@@ -148,17 +230,20 @@ def calculate_metrics(df: pd.DataFrame, event_col: str = "event_type") -> dict[s
         metrics["overall_conversion_rate"] = purchases / views if views > 0 else 0
 
     if "revenue" in df.columns:
-        metrics["total_revenue"] = df["revenue"].sum()
-        metrics["avg_order_value"] = (
-            df[df["revenue"] > 0]["revenue"].mean() if (df["revenue"] > 0).any() else 0
-        )
+        # One pass for the positive-revenue mask, shared by both metrics
+        revenue = df["revenue"].to_numpy(dtype="float64", na_value=np.nan)
+        positive = revenue > 0
+        metrics["total_revenue"] = np.nansum(revenue)
+        metrics["avg_order_value"] = revenue[positive].mean() if positive.any() else 0
 
     return metrics
 
 
 def format_number(value: float | int, precision: int = 2) -> str:
     """Format a number with thousands separators."""
-    if isinstance(value, int) or value == int(value):
+    if isinstance(value, int):
+        return f"{value:,}"
+    if value.is_integer():
         return f"{int(value):,}"
     return f"{value:,.{precision}f}"
 
@@ -170,8 +255,7 @@ def format_percentage(value: float, precision: int = 1) -> str:
 
 def format_currency(value: float, currency: str = "USD") -> str:
     """Format a number as currency."""
-    symbols = {"USD": "$", "EUR": "€", "GBP": "£"}
-    symbol = symbols.get(currency, currency + " ")
+    symbol = _CCY_SYMBOLS.get(currency, currency + " ")
     return f"{symbol}{value:,.2f}"
 
 
@@ -189,66 +273,124 @@ def create_date_dimension(
     Returns:
         DataFrame with date dimension attributes
     """
-    if isinstance(start_date, str):
-        start_date = datetime.fromisoformat(start_date)
-    if isinstance(end_date, str):
-        end_date = datetime.fromisoformat(end_date)
-
-    dates = pd.date_range(start=start_date, end=end_date, freq="D")
+    dates = generate_date_range(start_date, end_date, as_index=True)
+
+    # Derive calendar fields with datetime64 arithmetic on the wall-clock days
+    # rather than one .dt accessor pass per attribute
+    local = dates.tz_localize(None) if dates.tz is not None else dates
+    days = local.to_numpy().astype("datetime64[D]")
+    months = days.astype("datetime64[M]")
+    year = days.astype("datetime64[Y]").astype(np.int32) + 1970
+    month = months.astype(np.int32) % 12 + 1
+    day = (days - months).astype(np.int32) + 1
+    # 1970-01-01 was a Thursday; shift so Monday is 0
+    day_of_week = (days.astype(np.int64) + 3) % 7
+    # The ISO week is the week of the year holding that week's Thursday
+    thursday = days - day_of_week + 3
+    week = (thursday - thursday.astype("datetime64[Y]")).astype(np.int64) // 7 + 1
 
     dim_date = pd.DataFrame({"date": dates})
-    dim_date["date_key"] = dim_date["date"].dt.strftime("%Y%m%d").astype(int)
-    dim_date["year"] = dim_date["date"].dt.year
-    dim_date["quarter"] = dim_date["date"].dt.quarter
-    dim_date["month"] = dim_date["date"].dt.month
-    dim_date["month_name"] = dim_date["date"].dt.month_name()
-    dim_date["week"] = dim_date["date"].dt.isocalendar().week
-    dim_date["day_of_month"] = dim_date["date"].dt.day
-    dim_date["day_of_week"] = dim_date["date"].dt.dayofweek
-    dim_date["day_name"] = dim_date["date"].dt.day_name()
-    dim_date["is_weekend"] = dim_date["day_of_week"].isin([5, 6])
-    dim_date["is_month_start"] = dim_date["date"].dt.is_month_start
-    dim_date["is_month_end"] = dim_date["date"].dt.is_month_end
+    dim_date["date_key"] = year * 10000 + month * 100 + day
+    dim_date["year"] = year
+    dim_date["quarter"] = (month - 1) // 3 + 1
+    dim_date["month"] = month
+    dim_date["month_name"] = _MONTH_NAMES.take(month)
+    dim_date["week"] = pd.array(week, dtype="UInt32")
+    dim_date["day_of_month"] = day
+    dim_date["day_of_week"] = day_of_week.astype(np.int32)
+    dim_date["day_name"] = _DAY_NAMES.take(day_of_week)
+    dim_date["is_weekend"] = day_of_week >= 5
+    dim_date["is_month_start"] = day == 1
+    dim_date["is_month_end"] = (days + 1).astype("datetime64[M]") != months
 
     return dim_date
 
 
-def get_env_config() -> dict[str, Any]:
-    """Get configuration from environment variables."""
-    return {
-        "database_url": os.getenv("DATABASE_URL", ""),
-        "bigquery_project": os.getenv("BIGQUERY_PROJECT", ""),
-        "bigquery_dataset": os.getenv("BIGQUERY_DATASET", "analytics"),
-        "gcs_bucket": os.getenv("GCS_BUCKET", ""),
-        "environment": os.getenv("ENVIRONMENT", "development"),
-        "log_level": os.getenv("LOG_LEVEL", "INFO"),
-    }
+@lru_cache(maxsize=1)
+def get_env_config() -> Mapping[str, Any]:
+    """
+    Get configuration from environment variables.
+
+    The environment is read once and the result cached as a read-only mapping;
+    call get_env_config.cache_clear() after changing the environment.
+    """
+    return MappingProxyType(
+        {
+            "database_url": os.getenv("DATABASE_URL", ""),
+            "bigquery_project": os.getenv("BIGQUERY_PROJECT", ""),
+            "bigquery_dataset": os.getenv("BIGQUERY_DATASET", "analytics"),
+            "gcs_bucket": os.getenv("GCS_BUCKET", ""),
+            "environment": os.getenv("ENVIRONMENT", "development"),
+            "log_level": os.getenv("LOG_LEVEL", "INFO"),
+        }
+    )
+
+
+# A wall-clock reading paired with a perf_counter_ns reading, so Timer can
+# report datetimes for its monotonic stamps without calling datetime.now()
+_CLOCK_ANCHOR = (datetime.now(), time.perf_counter_ns())
+
+
+def _perf_ns_to_datetime(stamp_ns: int | None) -> datetime | None:
+    """Convert a perf_counter_ns reading to wall-clock time via the anchor."""
+    if stamp_ns is None:
+        return None
+    anchor_time, anchor_ns = _CLOCK_ANCHOR
+    return anchor_time + timedelta(microseconds=(stamp_ns - anchor_ns) // 1000)
 
 
 class Timer:
-    """Context manager for timing code execution."""
+    """
+    Context manager for timing code execution.
 
-    def __init__(self, name: str = "Operation"):
+    The duration is printed on exit, or sent to ``logger.info`` when a logger
+    is given; pass ``verbose=False`` to only record it for ``elapsed``.
+    """
+
+    def __init__(
+        self,
+        name: str = "Operation",
+        verbose: bool = True,
+        logger: logging.Logger | None = None,
+    ):
         self.name = name
-        self.start_time: datetime | None = None
-        self.end_time: datetime | None = None
+        self.verbose = verbose
+        self.logger = logger
+        # Monotonic perf_counter_ns readings
+        self._start_ns: int | None = None
+        self._end_ns: int | None = None
 
     def __enter__(self) -> "Timer":
-        self.start_time = datetime.now()
+        self._start_ns = time.perf_counter_ns()
         return self
 
     def __exit__(self, *args: Any) -> None:
-        self.end_time = datetime.now()
-        duration = (self.end_time - self.start_time).total_seconds()
-        print(f"{self.name}: {duration:.2f} seconds")
+        self._end_ns = time.perf_counter_ns()
+        if not self.verbose:
+            return
+        message = f"{self.name}: {self.elapsed:.2f} seconds"
+        if self.logger is not None:
+            self.logger.info(message)
+        else:
+            print(message)
+
+    @property
+    def start_time(self) -> datetime | None:
+        """Wall-clock time the span started, or None if it has not started."""
+        return _perf_ns_to_datetime(self._start_ns)
+
+    @property
+    def end_time(self) -> datetime | None:
+        """Wall-clock time the span ended, or None if it is still running."""
+        return _perf_ns_to_datetime(self._end_ns)
 
     @property
     def elapsed(self) -> float:
         """Get elapsed time in seconds."""
-        if self.start_time is None:
+        if self._start_ns is None:
             return 0.0
-        end = self.end_time or datetime.now()
-        return (end - self.start_time).total_seconds()
+        end = self._end_ns if self._end_ns is not None else time.perf_counter_ns()
+        return (end - self._start_ns) / 1e9
 
 
 if __name__ == "__main__":
@@ -272,6 +414,4 @@ if __name__ == "__main__":
     # Timer
     print("\nTimer test:")
     with Timer("Sleep test"):
-        import time
-
         time.sleep(0.1)
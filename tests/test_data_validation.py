@@ -21,6 +21,8 @@ from scripts.data_validation import (
     UserSchema,
     DataQualityChecker,
     validate_events,
+    validate_products,
+    validate_users,
 )
 
 
@@ -192,6 +194,7 @@ class TestDataQualityChecker:
         checker.check_duplicates()
         duplicate_issues = [i for i in checker.issues if i["check"] == "duplicates"]
         assert len(duplicate_issues) == 1
+        assert duplicate_issues[0]["count"] == 2
 
     def test_null_rate_check(self, sample_df):
         """Test null rate detection."""
@@ -201,6 +204,46 @@ class TestDataQualityChecker:
         null_issues = [i for i in checker.issues if i["check"] == "null_rate"]
         assert len(null_issues) == 1
 
+    def test_revenue_outliers(self):
+        """Test z-score revenue outlier detection."""
+        df = pd.DataFrame({"revenue": [10.0] * 50 + [1000.0, 0.0]})
+        checker = DataQualityChecker(df)
+        checker.check_revenue_outliers()
+        outlier_issues = [i for i in checker.issues if i["check"] == "revenue_outliers"]
+        assert len(outlier_issues) == 1
+        assert outlier_issues[0]["count"] == 1
+        assert outlier_issues[0]["max_value"] == 1000.0
+
+    def test_future_timestamps(self, sample_df):
+        """Test detection of events with future timestamps."""
+        sample_df.loc[2, "timestamp"] = pd.Timestamp.now() + pd.Timedelta(days=1)
+        checker = DataQualityChecker(sample_df)
+        checker.check_temporal_order()
+        future_issues = [i for i in checker.issues if i["check"] == "future_timestamps"]
+        assert len(future_issues) == 1
+        assert future_issues[0]["count"] == 1
+
+    def test_session_integrity(self):
+        """Test detection of sessions with too many events."""
+        df = pd.DataFrame({"session_id": ["SES_1"] * 1001 + ["SES_2"] * 5 + [None] * 1001})
+        checker = DataQualityChecker(df)
+        checker.check_session_integrity()
+        session_issues = [i for i in checker.issues if i["check"] == "session_integrity"]
+        assert len(session_issues) == 1
+        assert session_issues[0]["count"] == 1
+
+    def test_mixed_type_ids(self):
+        """Test that object ID columns mixing str and int are still counted."""
+        df = pd.DataFrame({
+            "event_id": pd.Series(["EVT_1", 2, 2] + list(range(3, 2003)), dtype=object),
+            "session_id": pd.Series(["SES_1"] * 1001 + [7] * 1001 + [None], dtype=object),
+        })
+        checker = DataQualityChecker(df)
+        checker.check_duplicates()
+        checker.check_session_integrity()
+        counts = {i["check"]: i["count"] for i in checker.issues}
+        assert counts == {"duplicates": 2, "session_integrity": 2}
+
     def test_run_all_checks(self, sample_df):
         """Test running all checks."""
         checker = DataQualityChecker(sample_df)
@@ -248,6 +291,179 @@ class TestValidateEvents:
         # At least one should be valid (the first one)
         assert result.valid_records >= 1
 
+    def test_error_summary_by_field(self):
+        """Test that errors are counted per failing field."""
+        df = pd.DataFrame({
+            "event_id": ["EVT_1234567890ABCDEF", "invalid_id", "EVT_1234567890ABCDEF"],
+            "event_type": ["page_view", "page_view", "not_an_event"],
+            "user_id": ["USER_ABC123DEF456"] * 3,
+            "session_id": ["SES_1234567890ABCDEF"] * 3,
+            "timestamp": [datetime.now()] * 3,
+            "properties": ["{}", "{}", "{}"],
+            "revenue": [0.0, 0.0, -1.0],
+        })
+
+        valid_df, result = validate_events(df)
+        assert result.valid_records == 1
+        assert result.invalid_records == 2
+        assert result.error_summary == {"event_id": 1, "event_type": 1, "revenue": 1}
+        assert valid_df["event_id"].tolist() == ["EVT_1234567890ABCDEF"]
+
+    def test_null_optional_fields_are_valid(self):
+        """Test that missing optional values (None/NaN) pass validation."""
+        df = pd.DataFrame({
+            "event_id": ["EVT_1234567890ABCDEF", "EVT_ABCDEF1234567890"],
+            "event_type": ["page_view", "product_view"],
+            "user_id": ["USER_ABC123DEF456", "USER_ABC123DEF456"],
+            "session_id": ["SES_1234567890ABCDEF", "SES_1234567890ABCDEF"],
+            "timestamp": ["2024-01-01T10:00:00", "2024-01-01T10:05:00"],
+            "properties": ["{}", '{"product_id": "PROD_12345678"}'],
+            "product_id": [float("nan"), "PROD_12345678"],
+        })
+
+        valid_df, result = validate_events(df)
+        assert result.valid_records == 2
+        assert list(valid_df.columns) == list(EventSchema.model_fields)
+
+    def test_all_nan_optional_string_column(self):
+        """Test that an all-NaN (float) optional string column is left as is."""
+        df = pd.DataFrame({
+            "event_id": ["EVT_1234567890ABCDEF", "EVT_ABCDEF1234567890"],
+            "event_type": ["page_view", "page_view"],
+            "user_id": ["USER_ABC123DEF456", "USER_ABC123DEF456"],
+            "session_id": ["SES_1234567890ABCDEF", "SES_1234567890ABCDEF"],
+            "timestamp": ["2024-01-01T10:00:00", "2024-01-01T10:05:00"],
+            "properties": ["{}", "{}"],
+            "category": [float("nan"), float("nan")],
+        })
+
+        valid_df, result = validate_events(df)
+        assert result.valid_records == 2
+        assert valid_df["category"].isna().all()
+
+    def test_empty_dataframe_with_columns(self):
+        """Test validation of an empty DataFrame that has the event columns."""
+        df = pd.DataFrame({
+            "event_id": pd.Series(dtype=object),
+            "event_type": pd.Series(dtype=object),
+            "user_id": pd.Series(dtype=object),
+            "session_id": pd.Series(dtype=object),
+            "timestamp": pd.Series(dtype=object),
+            "properties": pd.Series(dtype=object),
+            "category": pd.Series(dtype=float),
+        })
+
+        valid_df, result = validate_events(df)
+        assert len(valid_df) == 0
+        assert result.total_records == 0
+
+    @pytest.mark.parametrize(
+        "timestamps",
+        [
+            ["2024-01-01T10:00:00", "2024-01-01T10:05:00"],
+            ["2024-01-01T10:00:00+02:00", "2024-01-01T10:05:00+02:00"],
+        ],
+    )
+    def test_timestamp_strings_parsed_like_schema(self, timestamps):
+        """Test that timestamp strings keep the timezone (or lack of one) the schema gives."""
+        df = pd.DataFrame({
+            "event_id": ["EVT_1234567890ABCDEF", "EVT_ABCDEF1234567890"],
+            "event_type": ["page_view", "page_view"],
+            "user_id": ["USER_ABC123DEF456", "USER_ABC123DEF456"],
+            "session_id": ["SES_1234567890ABCDEF", "SES_1234567890ABCDEF"],
+            "timestamp": timestamps,
+            "properties": ["{}", "{}"],
+        })
+
+        valid_df, result = validate_events(df)
+        assert result.valid_records == 2
+        expected = [EventSchema(**record).timestamp for record in df.to_dict("records")]
+        assert valid_df["timestamp"].dt.to_pydatetime().tolist() == expected
+        assert [ts.utcoffset() for ts in valid_df["timestamp"]] == [
+            ts.utcoffset() for ts in expected
+        ]
+
+    def test_invalid_json_properties(self):
+        """Test that non-object JSON properties fail validation."""
+        df = pd.DataFrame({
+            "event_id": ["EVT_1234567890ABCDEF", "EVT_ABCDEF1234567890"],
+            "event_type": ["page_view", "page_view"],
+            "user_id": ["USER_ABC123DEF456", "USER_ABC123DEF456"],
+            "session_id": ["SES_1234567890ABCDEF", "SES_1234567890ABCDEF"],
+            "timestamp": [datetime.now(), datetime.now()],
+            "properties": ["not json", "[1, 2]"],
+        })
+
+        _, result = validate_events(df)
+        assert result.valid_records == 0
+        assert result.error_summary == {"properties": 2}
+
+    def test_concatenated_frames(self):
+        """Test validation of Arrow-backed columns split across chunks."""
+        df = pd.DataFrame({
+            "event_id": ["EVT_1234567890ABCDEF"],
+            "event_type": ["page_view"],
+            "user_id": ["USER_ABC123DEF456"],
+            "session_id": ["SES_1234567890ABCDEF"],
+            "timestamp": [datetime.now()],
+            "properties": ["{}"],
+        })
+        combined = pd.concat([df, df.assign(event_id="EVT_BAD")], ignore_index=True)
+
+        _, result = validate_events(combined)
+        assert result.valid_records == 1
+        assert result.error_summary == {"event_id": 1}
+
+
+class TestValidateReferenceData:
+    """Tests for validate_products and validate_users."""
+
+    def test_validate_products(self):
+        """Test product validation keeps only valid rows."""
+        df = pd.DataFrame({
+            "product_id": ["PROD_12345678", "PROD_ABCDEF12", "bad"],
+            "product_name": ["Widget", "Gadget", "Thing"],
+            "category": ["Electronics", "Books", "Books"],
+            "price": [9.99, 0.0, 5.0],
+            "rating": [4.5, None, 3.0],
+        })
+
+        valid_df, result = validate_products(df)
+        assert result.valid_records == 1
+        assert result.error_summary == {"product_id": 1, "price": 1}
+        assert valid_df["in_stock"].tolist() == [True]
+
+    def test_numeric_booleans_are_coerced(self):
+        """Test that 1/0 flags accepted for bool fields come out as booleans."""
+        df = pd.DataFrame({
+            "product_id": ["PROD_12345678", "PROD_ABCDEF12", "PROD_00000000"],
+            "product_name": ["Widget", "Gadget", "Thing"],
+            "category": ["Electronics", "Books", "Books"],
+            "price": [9.99, 5.0, 5.0],
+            "in_stock": [1, 0.0, 2],
+        })
+
+        valid_df, result = validate_products(df)
+        assert result.error_summary == {"in_stock": 1}
+        assert pd.api.types.is_bool_dtype(valid_df["in_stock"])
+        assert valid_df["in_stock"].tolist() == [True, False]
+
+    def test_validate_users(self):
+        """Test user validation keeps only valid rows."""
+        df = pd.DataFrame({
+            "user_id": ["USER_ABC123DEF456", "USER_ABC123DEF457"],
+            "segment": ["browser", "invalid_segment"],
+            "primary_device": ["mobile", "desktop"],
+            "traffic_source": ["organic", "email"],
+            "country": ["US", "DE"],
+            "created_at": [datetime.now(), datetime.now()],
+        })
+
+        valid_df, result = validate_users(df)
+        assert result.valid_records == 1
+        assert result.error_summary == {"segment": 1}
+        assert valid_df["user_id"].tolist() == ["USER_ABC123DEF456"]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the ETL pipeline module.
+"""
+
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+import pytest
+
+# The pipeline imports its sibling modules by name, so add scripts/ to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from data_validation import validate_events
+from etl_pipeline import ETLPipeline, PipelineCache, PipelineConfig
+
+
+def write_events(path: Path, n: int = 20) -> None:
+    """Write a small parquet file of valid raw events."""
+    event_types = ["page_view", "product_view", "add_to_cart", "purchase"]
+    pd.DataFrame({
+        "event_id": [f"EVT_{i:016X}" for i in range(n)],
+        "event_type": [event_types[i % 4] for i in range(n)],
+        "user_id": [f"USER_{i % 3:012X}" for i in range(n)],
+        "session_id": [f"SES_{i % 5:016X}" for i in range(n)],
+        "timestamp": pd.date_range(datetime(2024, 1, 1), periods=n, freq="h"),
+        "properties": ["{}"] * n,
+        "device": ["mobile"] * n,
+        "country": ["US"] * n,
+        "traffic_source": ["organic"] * n,
+        "product_id": [f"PROD_{i % 4:08X}" for i in range(n)],
+        "category": ["Books"] * n,
+        "revenue": [19.99 if i % 4 == 3 else 0.0 for i in range(n)],
+    }).to_parquet(path, index=False)
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    """Pipeline with an in-memory DuckDB connection."""
+    config = PipelineConfig(
+        source_dir=tmp_path / "raw",
+        target_dir=tmp_path / "processed",
+        database_path=tmp_path / "warehouse.duckdb",
+    )
+    etl = ETLPipeline(config)
+    etl.conn = duckdb.connect()
+    yield etl
+    etl.conn.close()
+
+
+class TestTransform:
+    """Tests for ETLPipeline._transform on validated events."""
+
+    def test_coerced_values_from_validation(self, pipeline):
+        """Test that padded IDs and string revenue are normalised before transforming."""
+        df = pd.DataFrame({
+            "event_id": [" EVT_1234567890ABCDEF", "EVT_ABCDEF1234567890 "],
+            "event_type": ["product_view", "purchase"],
+            "user_id": ["USER_ABC123DEF456 ", "USER_ABC123DEF456"],
+            "session_id": ["SES_1234567890ABCDEF", " SES_1234567890ABCDEF"],
+            "timestamp": ["2024-01-01T10:00:00", "2024-01-01T10:05:00"],
+            "properties": ["{}", "{}"],
+            "product_id": ["PROD_12345678", " PROD_12345678 "],
+            "revenue": ["0", "19.99"],
+        })
+
+        valid_df, result = validate_events(df)
+        assert result.valid_records == 2
+        assert valid_df["revenue"].tolist() == [0.0, 19.99]
+        assert valid_df["session_id"].tolist() == ["SES_1234567890ABCDEF"] * 2
+
+        tables = pipeline._transform(valid_df)
+        sessions = tables["fct_sessions"]
+        assert len(sessions) == 1
+        assert sessions["total_revenue"].iloc[0] == pytest.approx(19.99)
+        assert sessions["unique_products"].iloc[0] == 1
+
+
+class TestLoad:
+    """Tests for loading parquet outputs into DuckDB."""
+
+    def test_target_dir_with_quote(self, pipeline, tmp_path):
+        """Test that a quote in the target path doesn't break the load SQL."""
+        pipeline.conn.execute("CREATE SCHEMA analytics")
+        target_dir = tmp_path / "o'brien"
+        target_dir.mkdir()
+        parquet_path = target_dir / "fct_events.parquet"
+        write_events(parquet_path, n=5)
+
+        pipeline._load_parquet_to_db("fct_events", parquet_path)
+        count = pipeline.conn.execute("SELECT COUNT(*) FROM analytics.fct_events").fetchone()
+        assert count == (5,)
+
+
+class TestPipelineCache:
+    """Tests for PipelineCache and cached pipeline runs."""
+
+    @pytest.fixture
+    def config(self, tmp_path):
+        """Pipeline config over one small raw events file."""
+        source_dir = tmp_path / "raw"
+        source_dir.mkdir()
+        write_events(source_dir / "events_20240101.parquet")
+        return PipelineConfig(
+            source_dir=source_dir,
+            target_dir=tmp_path / "processed",
+            database_path=tmp_path / "warehouse.duckdb",
+        )
+
+    def test_key_changes_with_inputs_and_options(self, tmp_path):
+        """Test that the key tracks the source files and the options."""
+        source = tmp_path / "events_20240101.parquet"
+        write_events(source)
+        key = PipelineCache.make_key([source], {"quality_checks": True})
+
+        assert PipelineCache.make_key([source], {"quality_checks": True}) == key
+        assert PipelineCache.make_key([source], {"quality_checks": False}) != key
+
+        write_events(source, n=30)
+        assert PipelineCache.make_key([source], {"quality_checks": True}) != key
+
+    def test_key_ignores_path_spelling(self, tmp_path, monkeypatch):
+        """Test that a relative and an absolute path to the same file share a key."""
+        source = tmp_path / "events_20240101.parquet"
+        write_events(source)
+        monkeypatch.chdir(tmp_path)
+
+        relative_key = PipelineCache.make_key([Path(source.name)], {})
+        assert relative_key == PipelineCache.make_key([source], {})
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test that entries beyond max_entries are evicted oldest-use first."""
+        output = tmp_path / "fct_events.parquet"
+        output.write_bytes(b"data")
+        cache = PipelineCache(tmp_path / ".cache", max_entries=2)
+
+        cache.put("a", [output], {})
+        cache.put("b", [output], {})
+        os.utime(cache.cache_dir / "a", (1000, 1000))
+        os.utime(cache.cache_dir / "b", (2000, 2000))
+        assert cache.get("a") is not None  # marks "a" as recently used
+        cache.put("c", [output], {})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_restored_run_matches(self, config, monkeypatch):
+        """Test that a cached run restores the same outputs and metrics."""
+        first = ETLPipeline(config).run()
+        outputs = {p.name: pd.read_parquet(p) for p in config.target_dir.glob("*.parquet")}
+        assert set(outputs) >= {"fct_events.parquet", "fct_sessions.parquet"}
+
+        def fail_extract(self, source_files):
+            raise AssertionError("cached run should not re-extract")
+
+        monkeypatch.setattr(ETLPipeline, "_extract", fail_extract)
+        second = ETLPipeline(config).run()
+
+        assert second.records_loaded == first.records_loaded
+        assert second.validity_rate == first.validity_rate
+        for name, expected in outputs.items():
+            pd.testing.assert_frame_equal(pd.read_parquet(config.target_dir / name), expected)
+
+        with duckdb.connect(str(config.database_path), read_only=True) as conn:
+            restored = conn.execute("SELECT * FROM analytics.fct_sessions").df()
+        assert len(restored) == len(outputs["fct_sessions.parquet"])
+
+    def test_rewriting_outputs_keeps_cached_copy(self, config):
+        """Test that a later run does not overwrite the cached files it replaces."""
+        ETLPipeline(config).run()
+        [entry] = [p for p in (config.target_dir / ".cache").iterdir() if p.is_dir()]
+        cached = pd.read_parquet(entry / "fct_events.parquet")
+        # The entry links the output file rather than holding a second copy
+        output_stat = (config.target_dir / "fct_events.parquet").stat()
+        assert (entry / "fct_events.parquet").stat().st_ino == output_stat.st_ino
+
+        write_events(config.source_dir / "events_20240101.parquet", n=30)
+        ETLPipeline(config).run()
+
+        assert len(pd.read_parquet(config.target_dir / "fct_events.parquet")) == 30
+        pd.testing.assert_frame_equal(pd.read_parquet(entry / "fct_events.parquet"), cached)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the event generator module.
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.generate_events import EventGenerator
+
+
+def generate(seed: int | None, workers: int) -> pd.DataFrame:
+    """Generate a small batch of events."""
+    generator = EventGenerator(num_events=3000, num_days=3, num_users=200, seed=seed)
+    return generator.generate(workers=workers)
+
+
+class TestEventGenerator:
+    """Tests for EventGenerator.generate."""
+
+    @pytest.fixture(scope="class")
+    def single(self):
+        """Events from a single-worker run."""
+        return generate(seed=7, workers=1)
+
+    @pytest.fixture(scope="class")
+    def sharded(self):
+        """Events from a run split over three workers."""
+        return generate(seed=7, workers=3)
+
+    def test_sessions_belong_to_one_user(self, sharded):
+        """Test that every session's events share one user when sharded."""
+        users_per_session = sharded.groupby("session_id")["user_id"].nunique()
+        assert (users_per_session == 1).all()
+
+    def test_sharded_totals_match_single_worker(self, single, sharded):
+        """Test that sharding keeps the number of events and the events per user."""
+        assert len(sharded) == len(single)
+        assert sharded["event_id"].is_unique
+        pd.testing.assert_series_equal(
+            sharded["user_id"].value_counts().sort_index(),
+            single["user_id"].value_counts().sort_index(),
+        )
+        assert sharded["timestamp"].is_monotonic_increasing
+
+    def test_seed_zero_is_reproducible(self):
+        """Test that seed 0 counts as a seed for sharded runs."""
+        columns = ["event_id", "user_id", "session_id", "event_type", "revenue"]
+        first = generate(seed=0, workers=2)[columns]
+        second = generate(seed=0, workers=2)[columns]
+        pd.testing.assert_frame_equal(
+            first.sort_values("event_id", ignore_index=True),
+            second.sort_values("event_id", ignore_index=True),
+        )
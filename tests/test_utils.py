@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Unit tests for utility functions.
+"""
+
+import json
+import logging
+import math
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import utils
+from scripts.utils import (
+    Timer,
+    create_date_dimension,
+    flatten_dict,
+    json_loads,
+    safe_json_loads,
+    to_json,
+)
+
+
+class TestCreateDateDimension:
+    """Tests for create_date_dimension."""
+
+    @staticmethod
+    def reference(dates: pd.DatetimeIndex) -> pd.DataFrame:
+        """Build the date dimension with the pandas .dt accessors."""
+        dim_date = pd.DataFrame({"date": dates})
+        dim_date["date_key"] = dim_date["date"].dt.strftime("%Y%m%d").astype(int)
+        dim_date["year"] = dim_date["date"].dt.year
+        dim_date["quarter"] = dim_date["date"].dt.quarter
+        dim_date["month"] = dim_date["date"].dt.month
+        dim_date["month_name"] = dim_date["date"].dt.month_name()
+        dim_date["week"] = dim_date["date"].dt.isocalendar().week
+        dim_date["day_of_month"] = dim_date["date"].dt.day
+        dim_date["day_of_week"] = dim_date["date"].dt.dayofweek
+        dim_date["day_name"] = dim_date["date"].dt.day_name()
+        dim_date["is_weekend"] = dim_date["day_of_week"].isin([5, 6])
+        dim_date["is_month_start"] = dim_date["date"].dt.is_month_start
+        dim_date["is_month_end"] = dim_date["date"].dt.is_month_end
+        return dim_date
+
+    @pytest.mark.parametrize(
+        "start, end",
+        [
+            # ISO weeks 52/53/1 around year ends, and a leap day
+            ("2019-12-20", "2021-01-15"),
+            ("2023-12-25", "2024-03-05"),
+            ("2025-12-20", "2026-01-10"),
+            # Timezone-aware: calendar fields follow the wall-clock date
+            ("2024-03-25T00:00:00+01:00", "2024-04-05T00:00:00+01:00"),
+        ],
+    )
+    def test_matches_dt_accessors(self, start, end):
+        """Test that every column matches the pandas .dt/isocalendar() output."""
+        dim_date = create_date_dimension(start, end)
+        expected = self.reference(pd.date_range(start, end, freq="D"))
+
+        assert list(dim_date.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(dim_date, expected, check_dtype=False)
+
+
+def flatten_recursive(d: dict, parent_key: str = "", sep: str = "_") -> dict:
+    """The recursive flatten_dict the iterative version replaced."""
+    items: list = []
+    for k, v in d.items():
+        new_key = f"{parent_key}{sep}{k}" if parent_key else k
+        if isinstance(v, dict):
+            items.extend(flatten_recursive(v, new_key, sep).items())
+        else:
+            items.append((new_key, v))
+    return dict(items)
+
+
+class TestFlattenDict:
+    """Tests for flatten_dict."""
+
+    @pytest.mark.parametrize(
+        "d",
+        [
+            {},
+            {"a": 1, "b": "x"},
+            {"a": {"b": 1, "c": 2}},
+            {"a": {"b": {"c": {"d": 1}}, "e": 2}, "f": [1, {"g": 3}], "h": None},
+            # Empty nested dicts contribute no keys
+            {"a": {}, "b": {"c": {}}, "d": 1},
+            # Key collisions resolve the same way (last write wins, first position)
+            {"a_b": 1, "a": {"b": 2}, "c": 3},
+        ],
+    )
+    def test_matches_recursive_version(self, d):
+        """Test that keys, values and key order match the recursive version."""
+        flat = flatten_dict(d)
+        expected = flatten_recursive(d)
+        assert flat == expected
+        assert list(flat) == list(expected)
+
+    def test_parent_key_and_separator(self):
+        """Test that the parent key and separator are applied like the recursive version."""
+        d = {"a": {"b": 1}, "c": 2}
+        assert flatten_dict(d, parent_key="p", sep=".") == {"p.a.b": 1, "p.c": 2}
+        assert flatten_dict(d, "p", ".") == flatten_recursive(d, "p", ".")
+
+
+class TestJson:
+    """Tests for json_loads and to_json, with and without orjson."""
+
+    @pytest.fixture(params=["orjson", "stdlib"], autouse=True)
+    def backend(self, request, monkeypatch):
+        """Run each test with orjson (when installed) and with the standard library."""
+        if request.param == "stdlib":
+            monkeypatch.setattr(utils, "orjson", None)
+        elif utils.orjson is None:
+            pytest.skip("orjson is not installed")
+        return request.param
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "{}",
+            '{"a": 1, "b": [1, 2.5, null, true], "c": {"d": "e"}}',
+            '{"name": "caf\\u00e9 \\ud83d\\ude00", "raw": "caf\u00e9"}',
+            '{"total": 19.99, "tiny": 1e-300, "neg": -0.0}',
+            # Integers wider than 64 bits, which orjson can't represent exactly
+            '{"id": 123456789012345678901234567890, "u64": 18446744073709551615}',
+            '{"x": NaN, "y": Infinity, "z": -Infinity}',
+            '[1, "two", 3]',
+            '"text"',
+        ],
+    )
+    def test_loads_matches_stdlib(self, text):
+        """Test that decoded values (and their types) match json.loads."""
+        result, expected = json_loads(text), json.loads(text)
+        assert repr(result) == repr(expected)
+
+    @pytest.mark.parametrize("text", ["", "{", '{"a": }', "{'a': 1}", "[1, 2,]"])
+    def test_loads_invalid_raises_json_error(self, text):
+        """Test that invalid text raises json.JSONDecodeError like json.loads."""
+        with pytest.raises(json.JSONDecodeError):
+            json_loads(text)
+
+    @pytest.mark.parametrize(
+        "obj",
+        [
+            {},
+            {"product_id": "PROD_12345678", "quantity": 2, "total": 39.98, "items": [1, 2]},
+            {"nested": {"flag": True, "none": None}, "name": "caf\u00e9"},
+            [0.1, 1e-7, 123456789, -1],
+        ],
+    )
+    def test_to_json_round_trips(self, obj):
+        """Test that to_json output is compact and decodes with json.loads to the input."""
+        text = to_json(obj)
+        assert json.loads(text) == obj
+        assert json.loads(text) == json.loads(json.dumps(obj))
+        assert ", " not in text and ": " not in text
+
+    def test_safe_json_loads_nan(self):
+        """Test that NaN literals decode rather than being treated as invalid."""
+        assert math.isnan(safe_json_loads('{"x": NaN}')["x"])
+
+
+class TestTimer:
+    """Tests for Timer."""
+
+    def test_elapsed_and_wall_clock_times(self):
+        """Test that elapsed time and the start/end datetimes describe the span."""
+        timer = Timer(verbose=False)
+        assert timer.elapsed == 0.0
+        assert timer.start_time is None
+
+        before = datetime.now()
+        with timer:
+            time.sleep(0.02)
+            assert timer.end_time is None
+            assert timer.elapsed > 0
+        after = datetime.now()
+
+        assert 0.02 <= timer.elapsed < 1
+        tolerance = timedelta(milliseconds=50)
+        assert before - tolerance <= timer.start_time <= timer.end_time <= after + tolerance
+        span = (timer.end_time - timer.start_time).total_seconds()
+        assert span == pytest.approx(timer.elapsed, abs=1e-5)
+
+    def test_elapsed_is_fixed_after_exit(self):
+        """Test that elapsed stops counting once the span has ended."""
+        with Timer(verbose=False) as timer:
+            pass
+        elapsed = timer.elapsed
+        time.sleep(0.01)
+        assert timer.elapsed == elapsed
+
+    def test_prints_by_default(self, capsys):
+        """Test that the duration is printed on exit."""
+        with Timer("Load"):
+            pass
+        assert capsys.readouterr().out.startswith("Load: ")
+
+    def test_quiet_when_not_verbose(self, capsys):
+        """Test that verbose=False only records the duration."""
+        with Timer("Load", verbose=False):
+            pass
+        assert capsys.readouterr().out == ""
+
+    def test_logs_to_logger(self, capsys, caplog):
+        """Test that the duration goes to the logger instead of stdout."""
+        logger = logging.getLogger("test_utils.timer")
+        with caplog.at_level(logging.INFO, logger=logger.name), Timer("Load", logger=logger):
+            pass
+        assert capsys.readouterr().out == ""
+        assert [record.getMessage()[:6] for record in caplog.records] == ["Load: "]
+        assert caplog.records[0].getMessage().endswith(" seconds")